@@ -0,0 +1,105 @@
+"""Measure what ModelResponse saves per endpoint.
+
+Each endpoint shape of this app is served twice from the same data: once the
+default way (return the model, FastAPI validates it against response_model
+and encodes it) and once wrapped in ModelResponse (serialized directly).
+Requests go through the full ASGI stack in-process via httpx.
+
+Usage:
+    python bench_responses.py
+    python bench_responses.py --users 1000 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from models.item import Item, Item_Response
+from models.user import User, User_Response
+from responses import ModelResponse
+
+
+def build_app(n_users):
+    users = [
+        User(id=i, username=f"user{i}", email=f"user{i}@foo.com", full_name=f"User {i}", is_active=True)
+        for i in range(1, n_users + 1)
+    ]
+    item = Item(id=1, name="Item1", description="Description of Item1", price=10.0)
+    app = FastAPI()
+
+    # GET /users/{id}
+    @app.get("/default/user", response_model=User)
+    def default_user():
+        return users[0]
+
+    @app.get("/fast/user", response_model=User)
+    def fast_user():
+        return ModelResponse(users[0])
+
+    # GET /users/
+    @app.get("/default/users", response_model=list[User])
+    def default_users():
+        return users
+
+    @app.get("/fast/users", response_model=list[User])
+    def fast_users():
+        return ModelResponse(users)
+
+    # POST /users/ and DELETE /users/{id}
+    @app.get("/default/user_response", response_model=User_Response)
+    def default_user_response():
+        return User_Response(id=users[0].id, full_name=users[0].full_name)
+
+    @app.get("/fast/user_response", response_model=User_Response)
+    def fast_user_response():
+        return ModelResponse(User_Response(id=users[0].id, full_name=users[0].full_name))
+
+    # GET /items/{id}
+    @app.get("/default/item", response_model=Item_Response)
+    def default_item():
+        return item
+
+    @app.get("/fast/item", response_model=Item_Response)
+    def fast_item():
+        return ModelResponse(Item_Response.model_construct(id=item.id, name=item.name))
+
+    return app
+
+
+async def timed(client, url, requests):
+    for _ in range(min(requests, 100)):
+        await client.get(url)
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(url)
+    elapsed = time.perf_counter() - start
+    return elapsed / requests * 1e6, response.content
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100, help="users in the list endpoint")
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    app = build_app(args.users)
+    shapes = [
+        ("GET /users/{id}", "user"),
+        (f"GET /users/ ({args.users})", "users"),
+        ("POST, DELETE /users/", "user_response"),
+        ("GET /items/{id}", "item"),
+    ]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        print(f"{'endpoint':<24}{'default us':>12}{'fast us':>10}{'saved':>9}")
+        for name, path in shapes:
+            default, default_body = await timed(client, f"/default/{path}", args.requests)
+            fast, fast_body = await timed(client, f"/fast/{path}", args.requests)
+            # Same JSON, apart from whitespace
+            assert httpx.Response(200, content=default_body).json() == httpx.Response(200, content=fast_body).json()
+            print(f"{name:<24}{default:>12.1f}{fast:>10.1f}{(default - fast) / default:>9.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
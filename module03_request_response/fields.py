@@ -0,0 +1,21 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+def parse_fields(fields: str, allowed) -> list:
+    """Parse a sparse fieldset like `fields=id,username` into a list of field
+    names, in the order given."""
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in allowed]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(unknown) or fields}")
+    return selected
+
+
+def select_fields(records, fields: str, allowed) -> JSONResponse:
+    """Only the requested fields of each record, in the requested order.
+
+    Partial records don't match the route's response_model, so they are
+    returned directly as a JSON list."""
+    selected = parse_fields(fields, allowed)
+    return JSONResponse([{f: getattr(record, f) for f in selected} for record in records])
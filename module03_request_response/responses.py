@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+
+
+class ModelResponse(JSONResponse):
+    """JSON response for content that is already a validated Pydantic model
+    (or a list of them).
+
+    Returning a model from a route makes FastAPI validate it again against
+    `response_model` and convert it to dicts before encoding. Returning it
+    wrapped in ModelResponse skips both: pydantic-core serializes the model
+    straight to bytes. Keep `response_model` on the route for the docs, and
+    only use this for data you trust, e.g. models you just built or
+    `Model.model_construct(...)` from database rows."""
+
+    def render(self, content) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if isinstance(content, (list, tuple)) and all(isinstance(item, BaseModel) for item in content):
+            return b"[" + b",".join(item.model_dump_json().encode() for item in content) + b"]"
+        return super().render(content)
@@ -1,22 +1,24 @@
 from fastapi import APIRouter, HTTPException
 from models.item import Item, Item_Response
+from responses import ModelResponse
+from store import IndexedStore
 
 router = APIRouter()
 
-items = [
+items = IndexedStore([
     Item(id=1, name="Item1", description="Description of Item1", price=10.0),
     Item(id=2, name="Item2", description="Description of Item2", price=20.0),
     Item(id=3, name="Item3", description="Description of Item3", price=30.0),
-]
+], key="id")
 
 @router.get("/")
 def get_items():
-    return items
+    return ModelResponse(items.values())
 
 @router.get("/{id}", response_model=Item_Response)
 def get_item(id: int):
-    # return item from the items list based on the provided id
-    for item in items:
-        if item.id == id:
-            return item
+    # return item from the items store based on the provided id
+    item = items.get(id)
+    if item:
+        return ModelResponse(Item_Response.model_construct(id=item.id, name=item.name))
     raise HTTPException(status_code=404, detail="Item not found")
\ No newline at end of file
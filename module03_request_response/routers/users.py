@@ -1,43 +1,50 @@
 from fastapi import APIRouter, HTTPException
 from models.user import User, User_Response
+from fields import select_fields
+from responses import ModelResponse
+from store import DuplicateError, IndexedStore
 
 router = APIRouter()
 
 
-users = [
+# Users by id, with usernames and emails kept unique
+users = IndexedStore([
         User(id=1, username= "Alice", email= "alice@foo.com", full_name= "Alice Smith", is_active= True),
         User(id=2, username= "Bob", email= "boob@foo.com", full_name= "Bob Johnson", is_active= True)
-         ]
+         ], key="id", unique=("username", "email"))
 
+# fields: comma separated subset of the User fields, e.g. ?fields=id,username
+# (returned in the requested order)
 @router.get("/")
-def get_users():
-    return users
+def get_users(fields: str = None):
+    if not fields:
+        return ModelResponse(users.values())
+    return select_fields(users.values(), fields, User.model_fields)
 
 @router.post("/", response_model=User_Response)
 def create_user(user: User):
-    # Check if user with the same id already exists
-    for existing_user in users:
-        if existing_user.id == user.id:
-            raise HTTPException(status_code=400, detail="User with this ID already exists")
-    
-    # Add the new user to the list
-    users.append(user)
-    return User_Response(id=user.id, full_name=user.full_name)
+    # Add the new user, unless its id, username or email is taken
+    try:
+        users.add(user)
+    except DuplicateError as e:
+        field = "ID" if e.field == "id" else e.field
+        raise HTTPException(status_code=400, detail=f"User with this {field} already exists")
+    return ModelResponse(User_Response(id=user.id, full_name=user.full_name))
 
 
 @router.delete("/{id}", response_model=User_Response)
 def delete_user(id: int):
-    for idx, user in enumerate(users):
-        if user.id == id:
-            removed_user = users.pop(idx)
-            return removed_user
+    removed_user = users.remove(id)
+    if removed_user:
+        # Validated: full_name is optional on User but required on User_Response
+        return ModelResponse(User_Response(id=removed_user.id, full_name=removed_user.full_name))
     raise HTTPException(status_code=404, detail="User not found")
 
 
 @router.get("/{id}", response_model=User)
 def get_user(id: int):
-    # return user from the users list based on the provided id
-    for user in users:
-        if user.id == id:
-            return user
+    # return user from the users store based on the provided id
+    user = users.get(id)
+    if user:
+        return ModelResponse(user)
     raise HTTPException(status_code=404, detail="User not found")
\ No newline at end of file
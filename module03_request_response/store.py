@@ -0,0 +1,70 @@
+import threading
+
+
+class DuplicateError(ValueError):
+    def __init__(self, field: str, value):
+        super().__init__(f"{field}={value!r} already exists")
+        self.field = field
+        self.value = value
+
+
+class IndexedStore:
+    """In-memory records keyed by `key`, in insertion order.
+
+    Lookups by key and by the `unique` fields are dict lookups, so get,
+    add (with its duplicate checks) and remove are O(1) however many
+    records there are. Mutations take a lock: sync route handlers run
+    concurrently in the threadpool, and checking for duplicates then
+    inserting must happen as one step."""
+
+    def __init__(self, records=(), key: str = "id", unique=()):
+        self.key = key
+        self.unique = tuple(unique)
+        self._records = {}
+        self._indexes = {field: {} for field in self.unique}
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def values(self) -> list:
+        # A copy, so callers can iterate while other threads add or remove
+        return list(self._records.values())
+
+    def get(self, key):
+        return self._records.get(key)
+
+    def get_by(self, field: str, value):
+        key = self._indexes[field].get(value)
+        return None if key is None else self._records[key]
+
+    def add(self, record):
+        key = getattr(record, self.key)
+        with self._lock:
+            if key in self._records:
+                raise DuplicateError(self.key, key)
+            values = {field: getattr(record, field) for field in self.unique}
+            for field, value in values.items():
+                if value is not None and value in self._indexes[field]:
+                    raise DuplicateError(field, value)
+            self._records[key] = record
+            for field, value in values.items():
+                if value is not None:
+                    self._indexes[field][value] = key
+        return record
+
+    def remove(self, key):
+        """Remove and return the record with `key`, or None."""
+        with self._lock:
+            record = self._records.pop(key, None)
+            if record is not None:
+                for field in self.unique:
+                    value = getattr(record, field)
+                    if value is not None:
+                        self._indexes[field].pop(value, None)
+        return record
@@ -0,0 +1,55 @@
+import pytest
+
+from models.user import User
+from store import DuplicateError, IndexedStore
+
+
+def make_user(id, username, email):
+    return User(id=id, username=username, email=email, full_name=f"{username} Smith")
+
+
+# --- Fixtures ---
+@pytest.fixture
+def users():
+    return IndexedStore([
+        make_user(1, "Alice", "alice@foo.com"),
+        make_user(2, "Bob", "bob@foo.com"),
+    ], key="id", unique=("username", "email"))
+
+
+# --- Tests ---
+def test_lookups(users):
+    assert len(users) == 2
+    assert users.get(2).username == "Bob"
+    assert users.get_by("email", "alice@foo.com").id == 1
+    assert users.get(3) is None
+    assert users.get_by("username", "Carol") is None
+
+
+def test_duplicates_are_rejected(users):
+    with pytest.raises(DuplicateError) as exc:
+        users.add(make_user(3, "Alice", "other@foo.com"))
+    assert exc.value.field == "username"
+    with pytest.raises(DuplicateError):
+        users.add(make_user(1, "Carol", "carol@foo.com"))
+    # A rejected record leaves no trace in the indexes
+    assert users.get_by("email", "other@foo.com") is None
+    assert users.get_by("username", "Carol") is None
+
+
+def test_remove_updates_the_indexes(users):
+    removed = users.remove(1)
+    assert removed.username == "Alice"
+    assert 1 not in users
+    assert users.get_by("username", "Alice") is None
+    assert users.get_by("email", "alice@foo.com") is None
+    assert users.remove(1) is None
+    # Bob is untouched
+    assert users.get_by("email", "bob@foo.com").id == 2
+
+
+def test_removed_values_can_be_reused(users):
+    users.remove(1)
+    users.add(make_user(3, "Alice", "alice@foo.com"))
+    assert users.get_by("username", "Alice").id == 3
+    assert [user.id for user in users.values()] == [2, 3]
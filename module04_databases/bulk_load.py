@@ -0,0 +1,37 @@
+from itertools import islice
+
+from sqlalchemy import insert
+
+from models.article_comment_onetomany import Article, Comment
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def bulk_insert_articles(conn, articles, batch_size: int = 1000) -> int:
+    """Insert `(title, [comment content, ...])` pairs without the ORM unit of work.
+
+    Each batch is two statements: the articles as one multi-row
+    INSERT ... RETURNING id, whose ids come back in input order
+    (`sort_by_parameter_order`), then all their comments as one executemany.
+    Returns the number of articles inserted; the caller owns the transaction.
+
+        with engine.begin() as conn:
+            bulk_insert_articles(conn, [("Title", ["first", "second"])])
+    """
+    article_stmt = insert(Article).returning(Article.id, sort_by_parameter_order=True)
+    inserted = 0
+    for batch in _batches(articles, batch_size):
+        ids = conn.execute(article_stmt, [{"title": title} for title, _ in batch]).scalars().all()
+        comments = [
+            {"article_id": article_id, "content": content}
+            for article_id, (_, contents) in zip(ids, batch)
+            for content in contents
+        ]
+        if comments:
+            conn.execute(insert(Comment), comments)
+        inserted += len(ids)
+    return inserted
@@ -1,19 +1,50 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+import os
+
+from sqlalchemy import Column, Integer, String, ForeignKey, func, select
+from sqlalchemy.orm import relationship, selectinload, joinedload, lazyload, raiseload
 from sqlalchemy.ext.declarative import declarative_base
 
 
 Base = declarative_base()
 
+# How Article.comments is loaded:
+#   select   - one query per article, on first access (N+1 when listing articles)
+#   selectin - one extra "WHERE article_id IN (...)" query for all loaded articles
+#   joined   - LEFT OUTER JOIN in the article query itself
+#   raise    - accessing comments that were not eagerly loaded raises
+COMMENTS_LOADING = os.getenv("COMMENTS_LOADING", "selectin")
+
 class Article(Base):
     __tablename__ = 'articles'
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
-    comments = relationship("Comment")
+    comments = relationship("Comment", lazy=COMMENTS_LOADING)
 
 
 class Comment(Base):
     __tablename__ = 'comments'
     id = Column(Integer, primary_key=True)
     content = Column(String, nullable=False)
-    article_id = Column(Integer, ForeignKey('articles.id'))
\ No newline at end of file
+    article_id = Column(Integer, ForeignKey('articles.id'), index=True)
+
+
+LOADERS = {"select": lazyload, "selectin": selectinload, "joined": joinedload, "raise": raiseload}
+
+
+def load_comments(strategy: str):
+    """Query option overriding the loading strategy for one query, e.g.
+    session.query(Article).options(load_comments("joined"))"""
+    try:
+        return LOADERS[strategy](Article.comments)
+    except KeyError:
+        raise ValueError(f"Unknown loading strategy {strategy!r}, choose from: {', '.join(LOADERS)}")
+
+
+def comment_counts(session, article_ids=None) -> dict:
+    """{article_id: number of comments}, counted by the database with one
+    COUNT ... GROUP BY (served from ix_comments_article_id) instead of
+    loading the comments. Articles without comments are left out."""
+    query = select(Comment.article_id, func.count()).group_by(Comment.article_id)
+    if article_ids is not None:
+        query = query.where(Comment.article_id.in_(article_ids))
+    return dict(session.execute(query).all())
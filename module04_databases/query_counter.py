@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+
+from sqlalchemy import event
+
+# Literals and bound parameters, so queries differing only in values share a shape
+_PARAMS = re.compile(r"'(?:[^']|'')*'|\b\d+\b|%\(\w+\)s|%s|\?|:\w+|\$\d+")
+_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def query_shape(statement: str) -> str:
+    shape = _PARAMS.sub("?", " ".join(statement.split()))
+    return _LISTS.sub("(?...)", shape)
+
+
+class QueryCounter:
+    """Counts the SQL statements an engine executes inside a `with` block.
+
+    Statements are grouped by shape (SQL with values replaced), so a loop
+    that issues the same query once per row (the N+1 problem) shows up as a
+    shape executed many times:
+
+        with QueryCounter(engine) as queries:
+            for article in session.query(Article):
+                article.comments
+        queries.assert_no_repeats()
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        self.statements.clear()
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def shapes(self) -> Counter:
+        return Counter(query_shape(s) for s in self.statements)
+
+    def repeated(self, threshold: int = 2) -> dict:
+        """Shapes executed at least `threshold` times."""
+        return {shape: n for shape, n in self.shapes().items() if n >= threshold}
+
+    def assert_max_queries(self, limit: int):
+        if self.count > limit:
+            raise AssertionError(f"{self.count} queries executed, expected at most {limit}:\n" + self.report())
+
+    def assert_no_repeats(self, threshold: int = 2):
+        repeated = self.repeated(threshold)
+        if repeated:
+            raise AssertionError("Possible N+1 queries:\n" + "\n".join(f"  {n}x {shape}" for shape, n in repeated.items()))
+
+    def report(self) -> str:
+        return "\n".join(f"  {n}x {shape}" for shape, n in self.shapes().most_common())
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models.article_comment_onetomany import Article, Base, Comment, load_comments
+from query_counter import QueryCounter
+
+
+# --- Fixtures ---
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        for n in range(1, 6):
+            article = Article(title=f"Article {n}")
+            article.comments = [Comment(content=f"Comment {i}") for i in range(1, 3)]
+            session.add(article)
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def list_articles(engine, strategy):
+    with Session(engine) as session, QueryCounter(engine) as queries:
+        articles = session.query(Article).options(load_comments(strategy)).all()
+        assert sum(len(article.comments) for article in articles) == 10
+    return queries
+
+
+# --- Tests ---
+def test_lazy_loading_is_reported_as_n_plus_one(engine):
+    queries = list_articles(engine, "select")
+    assert queries.count == 6
+    with pytest.raises(AssertionError, match="Possible N\\+1 queries"):
+        queries.assert_no_repeats()
+
+
+@pytest.mark.parametrize("strategy, count", [("selectin", 2), ("joined", 1)])
+def test_eager_loading_has_no_repeats(engine, strategy, count):
+    queries = list_articles(engine, strategy)
+    queries.assert_no_repeats()
+    queries.assert_max_queries(count)
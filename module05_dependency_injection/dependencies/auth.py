@@ -1,6 +1,9 @@
 from fastapi import FastAPI, Depends, Query, HTTPException
 
+from dependency_profiler import timed
 
+
+@timed
 def get_current_user(token: str = Query(...)):
     if token == "secret":
         return  "authenticated_user"
@@ -0,0 +1,221 @@
+import inspect
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+# Opt-in: PROFILE_DEPENDENCIES=true
+PROFILE_DEPENDENCIES = os.getenv("PROFILE_DEPENDENCIES", "false").lower() in ("1", "true", "yes")
+
+# (name, seconds) pairs recorded while the current request is handled
+_timings: ContextVar = ContextVar("dependency_timings", default=None)
+
+
+def _name(call) -> str:
+    return getattr(call, "__name__", None) or type(call).__name__
+
+
+def _record(name, seconds):
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def timed(dependency=None, *, name: str = None):
+    """Records the time spent in a dependency for the profiler.
+
+    Use it as a decorator where the dependency is defined, so routes and
+    `dependency_overrides` keep referring to one function:
+
+        @timed
+        def get_current_user(token: str = Query(...)): ...
+
+    The wrapper has the dependency's signature and is of the same kind
+    (sync, async, generator, async generator), so FastAPI resolves and
+    caches it as before. Generator dependencies are timed up to their
+    `yield`, their teardown is reported as "<name>.teardown". Outside a
+    profiled request it only costs two clock reads."""
+    if dependency is None:
+        return lambda dependency: timed(dependency, name=name)
+    name = name or _name(dependency)
+    # Callable instances (e.g. security schemes) are called through __call__
+    target = dependency if inspect.isroutine(dependency) or inspect.isclass(dependency) else dependency.__call__
+
+    if inspect.isasyncgenfunction(target):
+        async def wrapper(*args, **kwargs):
+            cm = asynccontextmanager(dependency)(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                value = await cm.__aenter__()
+            finally:
+                _record(name, time.perf_counter() - start)
+            try:
+                yield value
+            except BaseException as exc:
+                start = time.perf_counter()
+                try:
+                    suppress = await cm.__aexit__(type(exc), exc, exc.__traceback__)
+                finally:
+                    _record(f"{name}.teardown", time.perf_counter() - start)
+                if not suppress:
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    await cm.__aexit__(None, None, None)
+                finally:
+                    _record(f"{name}.teardown", time.perf_counter() - start)
+    elif inspect.isgeneratorfunction(target):
+        def wrapper(*args, **kwargs):
+            cm = contextmanager(dependency)(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                value = cm.__enter__()
+            finally:
+                _record(name, time.perf_counter() - start)
+            try:
+                yield value
+            except BaseException as exc:
+                start = time.perf_counter()
+                try:
+                    suppress = cm.__exit__(type(exc), exc, exc.__traceback__)
+                finally:
+                    _record(f"{name}.teardown", time.perf_counter() - start)
+                if not suppress:
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    cm.__exit__(None, None, None)
+                finally:
+                    _record(f"{name}.teardown", time.perf_counter() - start)
+    elif inspect.iscoroutinefunction(target):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await dependency(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start)
+    else:
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return dependency(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start)
+
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__doc__ = dependency.__doc__
+    # Annotations evaluated here: the wrapper does not share the dependency's globals
+    wrapper.__signature__ = inspect.signature(dependency, eval_str=True)
+    wrapper.__timed__ = dependency
+    return wrapper
+
+
+class DependencyProfiler:
+    """Reports the time spent in `timed` dependencies, per request.
+
+    install() adds a middleware that collects the timings of each request
+    and sends them (plus `total`) as a Server-Timing header, and GET
+    /debug/dependencies with the totals and the dependencies resolved more
+    than once in a request (not cached: `use_cache=False`, or different
+    security scopes). Functions in `app.dependency_overrides` are timed
+    under the name of the dependency they replace."""
+
+    def __init__(self, app, path: str = "/debug/dependencies"):
+        self.app = app
+        self.path = path
+        self.stats = defaultdict(lambda: {"calls": 0, "total": 0.0, "max": 0.0})
+        self.requests = 0
+        self.uncached = Counter()  # name -> requests in which it resolved more than once
+
+    def install(self):
+        self.app.add_api_route(self.path, self.report, methods=["GET"], include_in_schema=False)
+        self.app.add_middleware(ServerTimingMiddleware, profiler=self)
+        return self
+
+    def time_overrides(self):
+        """Wrap new entries of app.dependency_overrides in `timed`."""
+        overrides = self.app.dependency_overrides
+        for dependency, override in list(overrides.items()):
+            if not hasattr(override, "__timed__"):
+                overrides[dependency] = timed(override, name=_name(dependency))
+
+    def collect(self, timings):
+        self.requests += 1
+        counts = Counter()
+        for name, seconds in timings:
+            stats = self.stats[name]
+            stats["calls"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            if not name.endswith(".teardown"):
+                counts[name] += 1
+        for name, n in counts.items():
+            if n > 1:
+                self.uncached[name] += 1
+
+    def report(self):
+        return {
+            "requests": self.requests,
+            "dependencies": {
+                name: {
+                    "calls": s["calls"],
+                    "calls_per_request": round(s["calls"] / self.requests, 3) if self.requests else None,
+                    "total_ms": round(s["total"] * 1000, 3),
+                    "mean_ms": round(s["total"] / s["calls"] * 1000, 3),
+                    "max_ms": round(s["max"] * 1000, 3),
+                }
+                for name, s in sorted(self.stats.items(), key=lambda item: -item[1]["total"])
+            },
+            "resolved_more_than_once": dict(self.uncached),
+        }
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware: collects the request's dependency timings and
+    adds them (plus `total`) as a Server-Timing header."""
+
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == self.profiler.path:
+            return await self.app(scope, receive, send)
+
+        self.profiler.time_overrides()
+        timings = []
+        token = _timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                totals = defaultdict(float)
+                for name, seconds in timings:
+                    totals[name] += seconds
+                entries = [f"{_metric_name(name)};dur={seconds * 1000:.3f}" for name, seconds in totals.items()]
+                entries.append(f"total;dur={(time.perf_counter() - start) * 1000:.3f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(entries).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            self.profiler.collect(timings)
+
+
+def install_dependency_profiler(app):
+    """Install the profiler on `app` if PROFILE_DEPENDENCIES is set."""
+    if PROFILE_DEPENDENCIES:
+        return DependencyProfiler(app).install()
+    return None
@@ -3,14 +3,18 @@ from typing import Optional
 from fastapi.exceptions import HTTPException
 
 from routers import users
+from dependency_profiler import install_dependency_profiler, timed
+from resources import provide, resources
 
-app = FastAPI()
+# App-scoped resources are created at startup and closed at shutdown
+app = FastAPI(lifespan=resources.lifespan)
 
 app.include_router(users.router, prefix="/users", tags=["Users"])
 
 # Live Coding - 1. Example
 
-# Dependency function
+# Dependency function (timed: reported by the dependency profiler)
+@timed
 def get_query_param(q: Optional[str] = None):
     return q
 
@@ -21,17 +25,28 @@ def search(query: str = Depends(get_query_param)):
 
 # Live Coding - 2. Example
 
-def get_fake_db():
-    # Simulate a database connection
-    yield {"users": ["Alice", "Bob", "Charlie"]}
+class FakeDB(dict):
+    """Simulated database connection"""
+
+@resources.register(FakeDB)
+def create_fake_db():
+    # Simulate opening a database connection: once, when the app starts
+    db = FakeDB(users=["Alice", "Bob", "Charlie"])
+    yield db
+    # ...and closing it when the app shuts down
+    db.clear()
+
+# Injects the shared FakeDB instead of creating one per request
+get_fake_db = provide(FakeDB)
 
 @app.get("/users")
-def read_users(db: dict = Depends(get_fake_db)):
+def read_users(db: FakeDB = Depends(get_fake_db)):
     return {"users": db["users"]}
 
 
 # Live Coding - 3. Example
 
+@timed
 def get_current_user(x_token: str = Header(...)):
     if x_token == "secret":
         return  "authenticated_user"
@@ -42,3 +57,6 @@ def read_profile(user: str = Depends(get_current_user)):
     return {"user": user}
 
 
+
+# Dependency profiling (PROFILE_DEPENDENCIES=true): Server-Timing headers and GET /debug/dependencies
+install_dependency_profiler(app)
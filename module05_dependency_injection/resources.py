@@ -0,0 +1,89 @@
+import inspect
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+
+from fastapi import HTTPException, Request
+
+
+class Resources:
+    """Registry of app-scoped dependencies: created once at startup, shared by
+    every request and closed at shutdown.
+
+    Register a factory for a type; like a dependency with `yield`, code after
+    the `yield` is the teardown (plain functions and coroutines work too):
+
+        @resources.register(httpx.AsyncClient)
+        async def create_http_client():
+            async with httpx.AsyncClient() as client:
+                yield client
+
+    and inject the instance by its type:
+
+        def handler(client: httpx.AsyncClient = Depends(provide(httpx.AsyncClient))): ...
+
+    Request-scoped dependencies (e.g. a DB session per request) stay ordinary
+    `Depends(...)` functions and can themselves depend on app-scoped ones."""
+
+    def __init__(self):
+        self._factories = {}
+        self._stack = None
+
+    def register(self, type_):
+        def decorator(factory):
+            self._factories[type_] = factory
+            return factory
+        return decorator
+
+    async def startup(self, app):
+        """Create every registered resource and store them in app.state."""
+        instances = {}
+        app.state.resources = instances
+        self._stack = AsyncExitStack()
+        for type_, factory in self._factories.items():
+            if inspect.isasyncgenfunction(factory):
+                instance = await self._stack.enter_async_context(asynccontextmanager(factory)())
+            elif inspect.isgeneratorfunction(factory):
+                instance = self._stack.enter_context(contextmanager(factory)())
+            else:
+                instance = factory()
+                if inspect.isawaitable(instance):
+                    instance = await instance
+            instances[type_] = instance
+
+    async def shutdown(self, app):
+        """Tear the resources down, in reverse order of creation."""
+        if self._stack is not None:
+            stack, self._stack = self._stack, None
+            await stack.aclose()
+        app.state.resources = {}
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """For FastAPI(lifespan=resources.lifespan)."""
+        await self.startup(app)
+        try:
+            yield
+        finally:
+            await self.shutdown(app)
+
+
+resources = Resources()
+
+_providers = {}
+
+
+def provide(type_):
+    """Dependency returning the app-scoped instance of `type_`.
+
+    The same function is returned for the same type, so FastAPI's
+    per-request cache and dependency_overrides treat it as one dependency."""
+    if type_ not in _providers:
+        # async: a plain dict lookup, no need for a threadpool hop
+        async def dependency(request: Request):
+            instance = getattr(request.app.state, "resources", {}).get(type_)
+            if instance is None:
+                # Not registered, or the app's startup (lifespan) has not run
+                raise HTTPException(status_code=503, detail=f"{type_.__name__} is not available")
+            return instance
+        dependency.__name__ = f"provide_{type_.__name__}"
+        _providers[type_] = dependency
+    return _providers[type_]
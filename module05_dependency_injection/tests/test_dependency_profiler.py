@@ -0,0 +1,98 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from dependency_profiler import DependencyProfiler, timed
+
+
+@timed
+def get_db():
+    yield "db"
+
+
+@timed
+async def get_current_user(db: str = Depends(get_db)):
+    return "alice"
+
+
+@timed
+def get_page(page: int = 1):
+    return page
+
+
+# --- Fixtures ---
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/items")
+    def read_items(user: str = Depends(get_current_user), page: int = Depends(get_page)):
+        return {"user": user, "page": page}
+
+    @app.get("/uncached")
+    def read_uncached(first: int = Depends(get_page), second: int = Depends(get_page, use_cache=False)):
+        return {"pages": [first, second]}
+
+    DependencyProfiler(app).install()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app)
+
+
+# --- Tests ---
+def test_timed_dependency_keeps_its_parameters(client):
+    response = client.get("/items", params={"page": 3})
+    assert response.status_code == 200
+    assert response.json() == {"user": "alice", "page": 3}
+
+
+def test_call_counts(client):
+    for _ in range(3):
+        client.get("/items")
+    report = client.get("/debug/dependencies").json()
+    assert report["requests"] == 3
+    dependencies = report["dependencies"]
+    for name in ("get_db", "get_db.teardown", "get_current_user", "get_page"):
+        assert dependencies[name]["calls"] == 3
+        assert dependencies[name]["calls_per_request"] == 1
+    assert report["resolved_more_than_once"] == {}
+
+
+def test_uncached_resolution_is_reported(client):
+    client.get("/uncached")
+    report = client.get("/debug/dependencies").json()
+    assert report["dependencies"]["get_page"]["calls"] == 2
+    assert report["resolved_more_than_once"] == {"get_page": 1}
+
+
+def test_override_is_timed_under_the_dependency_name(app, client):
+    calls = []
+
+    def fake_user():
+        calls.append(1)
+        return "bob"
+
+    app.dependency_overrides[get_current_user] = fake_user
+    response = client.get("/items")
+    assert response.json()["user"] == "bob"
+    assert calls == [1]
+    dependencies = client.get("/debug/dependencies").json()["dependencies"]
+    assert dependencies["get_current_user"]["calls"] == 1
+    # The override does not depend on get_db
+    assert "get_db" not in dependencies
+
+
+def test_server_timing_header(client):
+    response = client.get("/items")
+    entries = dict(entry.split(";dur=") for entry in response.headers["server-timing"].split(", "))
+    assert set(entries) == {"get_db", "get_db.teardown", "get_current_user", "get_page", "total"}
+    assert all(float(duration) >= 0 for duration in entries.values())
+
+
+def test_debug_endpoint_is_not_profiled(client):
+    response = client.get("/debug/dependencies")
+    assert "server-timing" not in response.headers
+    assert response.json()["requests"] == 0
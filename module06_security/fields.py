@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+def parse_fields(fields: str, allowed) -> list:
+    """Parse a sparse fieldset like `fields=id,username` into a list of field
+    names, in the order given."""
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in allowed]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(unknown) or fields}")
+    return selected
+
+
+def select_fields(query, model, fields: str, allowed) -> JSONResponse:
+    """Run `query` selecting only the requested columns of `model`.
+
+    Partial rows don't match the route's response_model, so they are
+    returned directly as a JSON list."""
+    selected = parse_fields(fields, allowed)
+    rows = query.with_entities(*[getattr(model, f) for f in selected]).all()
+    return JSONResponse([row._asdict() for row in rows])
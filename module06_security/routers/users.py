@@ -15,6 +15,8 @@ from models.user import (
 )
 
 from database import get_db
+from fields import select_fields
+from responses import ModelResponse
 from utils import (
     hash_password,
     verify_password,
@@ -63,11 +65,17 @@ def get_current_user(
 
 
 # --- Protected endpoint ---
+# fields: comma separated subset of the UserResponse fields, e.g. ?fields=username
+# Only the requested columns are selected from the database.
 @router.get("/", response_model=list[UserResponse])
 def get_users(
+    fields: str = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    if fields:
+        return select_fields(db.query(User), User, fields, UserResponse.model_fields)
+
     users = db.query(User).all()
     return users
 
@@ -90,10 +98,11 @@ def create_user(user_req: UserRequest, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_user)
 
-    return UserResponse(
+    # Built from the row we just stored: serialize directly, no re-validation
+    return ModelResponse(UserResponse.model_construct(
         username=new_user.username,
         email=new_user.email
-    )
+    ))
 
 
 # --- Login ---
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+
+
+class ModelResponse(JSONResponse):
+    """Serializes an already-validated Pydantic model (or a list of them)
+    straight to JSON, skipping FastAPI's response_model round trip. Only
+    for trusted data, e.g. a `model_construct` from a row just stored.
+
+    Each app in this repo is self-contained, so this mirrors
+    module03_request_response/responses.py."""
+
+    def render(self, content) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if isinstance(content, (list, tuple)) and all(isinstance(item, BaseModel) for item in content):
+            return b"[" + b",".join(item.model_dump_json().encode() for item in content) + b"]"
+        return super().render(content)
@@ -12,6 +12,8 @@ from fastapi.security import OAuth2PasswordBearer
 
 from models.user import User, UserRequest, UserResponse, UserLoginRequest, UserLoginResponse, ResponseMessage
 from database import get_db
+from fields import select_fields
+from responses import ModelResponse
 from utils import hash_password, verify_password, create_access_token, decode_access_token
 
 
@@ -44,9 +46,12 @@ def get_current_user(token: str = Security(oauth2_scheme), db: Session = Depends
         raise credentials_exception
     return user
 
+# Sparse fieldsets: ?fields=username selects only the requested columns
 @router.get("/", response_model=list[UserResponse])
 # @router.get("/", dependencies=[Depends(get_current_user)])
-def get_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_users(fields: str = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    if fields:
+        return select_fields(db.query(User), User, fields, UserResponse.model_fields)
     users = db.query(User).all()
     return users
 
@@ -74,8 +79,8 @@ def create_user(user_req: UserRequest, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_user)
     logging.info(f"Created new user: {new_user.id}")
-    response = UserResponse(username=new_user.username, email=new_user.email)
-    return response
+    # Built from the row we just stored: serialize directly, no re-validation
+    return ModelResponse(UserResponse.model_construct(username=new_user.username, email=new_user.email))
 
 
 @router.post("/login", response_model=UserLoginResponse)
@@ -0,0 +1,74 @@
+"""Rate limiter benchmark: 100k distinct clients hitting the limiter.
+
+Usage:
+    python bench_rate_limit.py [--clients 100000] [--hits 3] [--threads 8] [--backend memory|sqlite]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from rate_limit import MemoryBackend, SQLiteBackend, parse_rate
+
+
+def run(backend, clients: int, hits_per_client: int, threads: int, rate: str):
+    limit, window = parse_rate(rate)
+    keys = [f"/limited/:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+    work = keys * hits_per_client
+    random.shuffle(work)
+    chunks = [work[i::threads] for i in range(threads)]
+    allowed = [0] * threads
+
+    def worker(idx):
+        count = 0
+        for key in chunks[idx]:
+            if backend.hit(key, limit, window, time.time())[0]:
+                count += 1
+        allowed[idx] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return len(work), sum(allowed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--hits", type=int, default=3, help="hits per client")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rate", default="5/minute")
+    parser.add_argument("--max-keys", type=int, default=50_000)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    if args.backend == "sqlite":
+        path = os.path.join(tempfile.mkdtemp(), "rate_limit.db")
+        backend = SQLiteBackend(path)
+    else:
+        backend = MemoryBackend(max_keys=args.max_keys)
+
+    total, allowed, elapsed = run(backend, args.clients, args.hits, args.threads, args.rate)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"backend:       {args.backend}")
+    print(f"clients:       {args.clients:,}")
+    print(f"requests:      {total:,} ({allowed:,} allowed)")
+    print(f"elapsed:       {elapsed:.2f}s")
+    print(f"throughput:    {total / elapsed:,.0f} req/s")
+    print(f"latency:       {elapsed / total * 1e6:.1f} µs/req ({args.threads} threads)")
+    print(f"tracked keys:  {len(backend):,}")
+    print(f"peak memory:   {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
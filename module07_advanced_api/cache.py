@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+
+class TTLCache:
+    """Async-aware cache with TTL, stale-while-revalidate and single-flight.
+
+    - Entries are fresh for `ttl` seconds and served as-is.
+    - For the next `stale_ttl` seconds the stale value is still returned,
+      while a single background task recomputes it.
+    - Concurrent misses for the same key share one in-flight computation.
+    - At most `maxsize` keys are kept (least recently used is evicted).
+    - `cache_clear()`/`invalidate()` also drop the in-flight computations:
+      one that was already running still answers its callers, but its
+      (possibly outdated) result is not stored.
+    """
+
+    def __init__(self, func, ttl: float, stale_ttl: float = 0.0, maxsize: int = 128):
+        self.func = func
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (value, fresh_until)
+        self._inflight = {}            # key -> asyncio.Task
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.errors = 0
+        functools.update_wrapper(self, func)
+
+    @staticmethod
+    def _make_key(args, kwargs):
+        if kwargs:
+            return args + (object,) + tuple(sorted(kwargs.items()))
+        return args
+
+    async def __call__(self, *args, **kwargs):
+        value, _ = await self.get_with_status(*args, **kwargs)
+        return value
+
+    async def get_with_status(self, *args, **kwargs):
+        """Like calling the cache, but returns `(value, status)`, where status
+        is "hit", "stale" (served while refreshing), "miss" (computed for
+        this call) or "coalesced" (joined a computation already running)."""
+        key = self._make_key(args, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value, "hit"
+            if now < fresh_until + self.stale_ttl:
+                # Serve the stale value and refresh it in the background
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start(key, args, kwargs)
+                return value, "stale"
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            status = "miss"
+            task = self._start(key, args, kwargs)
+        else:
+            self.coalesced += 1
+            status = "coalesced"
+        # shield: a cancelled request must not cancel the shared computation
+        return await asyncio.shield(task), status
+
+    def _start(self, key, args, kwargs):
+        task = asyncio.ensure_future(self._compute(key, args, kwargs))
+        self._inflight[key] = task
+        task.add_done_callback(functools.partial(self._finished, key))
+        return task
+
+    async def _compute(self, key, args, kwargs):
+        if inspect.iscoroutinefunction(self.func):
+            value = await self.func(*args, **kwargs)
+        else:
+            value = await run_in_threadpool(self.func, *args, **kwargs)
+        if self._inflight.get(key) is not asyncio.current_task():
+            # Cleared or invalidated while computing: the result may be outdated
+            return value
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def _finished(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Failed computations are not cached; the next call retries
+            self.errors += 1
+
+    def cache_clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def invalidate(self, *args, **kwargs):
+        key = self._make_key(args, kwargs)
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def cache_info(self):
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "inflight": len(self._inflight),
+        }
+
+
+def ttl_cache(ttl: float, stale_ttl: float = 0.0, maxsize: int = 128):
+    """Decorator version of `TTLCache`. Works with sync and async functions;
+    sync functions are run in the threadpool so they never block the event loop.
+    The decorated function must be awaited."""
+    def decorator(func):
+        return TTLCache(func, ttl=ttl, stale_ttl=stale_ttl, maxsize=maxsize)
+    return decorator
@@ -0,0 +1,64 @@
+import os
+
+import aiosqlite
+
+
+# SQLite catalog used by /api/v2/products (see routers/products_v2.py)
+PRODUCTS_DB = os.getenv("PRODUCTS_DB", "products.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    description TEXT
+);
+
+-- Full-text index over name/description, kept in sync by the triggers below
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name, description, content='products', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS products_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS products_au AFTER UPDATE ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+END;
+"""
+
+db: aiosqlite.Connection = None
+
+
+async def connect(products=()):
+    """Open the catalog database, create the schema and seed it with
+    `products` if it is empty."""
+    global db
+    db = await aiosqlite.connect(PRODUCTS_DB)
+    db.row_factory = aiosqlite.Row
+    await db.execute("PRAGMA journal_mode=WAL")
+    await db.executescript(SCHEMA)
+    async with db.execute("SELECT COUNT(*) FROM products") as cursor:
+        (count,) = await cursor.fetchone()
+    if count == 0 and products:
+        await db.executemany(
+            "INSERT INTO products (id, name, price, description) VALUES (?, ?, ?, ?)",
+            [(p.id, p.name, p.price, p.description) for p in products],
+        )
+        await db.commit()
+
+
+async def disconnect():
+    global db
+    if db is not None:
+        await db.close()
+        db = None
+
+
+# Dependency for FastAPI routes
+async def get_db() -> aiosqlite.Connection:
+    return db
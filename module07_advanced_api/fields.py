@@ -0,0 +1,16 @@
+from fastapi import HTTPException
+
+
+def parse_fields(fields: str, allowed) -> list:
+    """Parse a sparse fieldset like `fields=id,price` into a list of field
+    names (in the order given). None means all fields."""
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in allowed]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(unknown) or fields!r}. Choose from: {', '.join(allowed)}",
+        )
+    return selected
@@ -0,0 +1,197 @@
+import asyncio
+import csv
+import json
+import time
+
+from pydantic import TypeAdapter, ValidationError
+
+from models.product import Product, ProductIn, add_items, get_catalog, reload_catalog, save_snapshot
+
+MAX_LINE_BYTES = 1 << 20
+
+product_batch = TypeAdapter(list[ProductIn])
+
+# Batches are applied one at a time, so the in-memory catalog and the
+# SQLite catalog see them in the same order.
+write_lock = asyncio.Lock()
+
+
+class IngestError(Exception):
+    pass
+
+
+async def iter_lines(stream):
+    """Yield (line_number, line) from an async stream of byte chunks
+    without holding more than one partial line in memory."""
+    buffer = b""
+    number = 0
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise IngestError(f"Line {number + len(lines) + 1} is longer than {MAX_LINE_BYTES} bytes")
+        for line in lines:
+            number += 1
+            yield number, line.decode("utf-8")
+    if buffer:
+        yield number + 1, buffer.decode("utf-8")
+
+
+async def iter_records(stream, fmt: str):
+    """Yield (line_number, record dict) from an NDJSON or CSV byte stream.
+    CSV needs a header row and one record per line."""
+    header = None
+    async for number, line in iter_lines(stream):
+        line = line.strip("\r")
+        if not line.strip():
+            continue
+        if fmt == "ndjson":
+            try:
+                yield number, json.loads(line)
+            except ValueError as exc:
+                yield number, exc
+        else:
+            row = next(csv.reader([line]))
+            if header is None:
+                header = [column.strip() for column in row]
+                continue
+            if len(row) != len(header):
+                yield number, ValueError(f"expected {len(header)} columns, got {len(row)}")
+                continue
+            yield number, {key: (value if value != "" else None) for key, value in zip(header, row)}
+
+
+class IngestReport:
+    def __init__(self, max_errors: int = 100):
+        self.accepted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+
+    def reject(self, line: int, error: str):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self):
+        elapsed = time.perf_counter() - self.started
+        total = self.accepted + self.rejected
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "errors": self.errors,
+            "elapsed_sec": round(elapsed, 4),
+            "rows_per_sec": round(total / elapsed, 1) if elapsed else None,
+        }
+
+
+async def apply_batch(rows, db, report: IngestReport):
+    """Validate a batch, then insert its valid rows into the SQLite catalog
+    (one transaction) and the in-memory catalog. Either both get the whole
+    batch or neither gets any of it."""
+    numbers = [number for number, _ in rows]
+    valid = {}
+    try:
+        products = product_batch.validate_python([record for _, record in rows])
+        valid = dict(enumerate(products))
+    except ValidationError as exc:
+        bad = {}
+        for error in exc.errors():
+            bad.setdefault(error["loc"][0], f"{'.'.join(map(str, error['loc'][1:]))}: {error['msg']}")
+        for index, record in enumerate(rows):
+            if index in bad:
+                report.reject(numbers[index], bad[index])
+            else:
+                valid[index] = ProductIn.model_validate(record[1])
+
+    async with write_lock:
+        catalog = get_catalog()
+        seen = set()
+        candidates = []
+        for index in sorted(valid):
+            product = valid[index]
+            if product.id in seen or catalog.get(product.id) is not None:
+                report.reject(numbers[index], f"id: product {product.id} already exists")
+                continue
+            seen.add(product.id)
+            candidates.append((numbers[index], product.to_product()))
+        if not candidates:
+            return
+
+        products = [product for _, product in candidates]
+        if db is not None:
+            try:
+                # The SQLite catalog outlives the in-memory one (and is shared by
+                # all workers), so ids are checked against it too, under a write
+                # lock taken before reading: existing products are never overwritten.
+                await db.execute("BEGIN IMMEDIATE")
+                placeholders = ", ".join("?" * len(products))
+                async with db.execute(
+                    f"SELECT id FROM products WHERE id IN ({placeholders})", [p.id for p in products]
+                ) as rows:
+                    stored = {row[0] for row in await rows.fetchall()}
+                products = []
+                for number, product in candidates:
+                    if product.id in stored:
+                        report.reject(number, f"id: product {product.id} already exists")
+                    else:
+                        products.append(product)
+                if products:
+                    await db.executemany(
+                        "INSERT INTO products (id, name, price, description) VALUES (?, ?, ?, ?)",
+                        [(p.id, p.name, p.price, p.description) for p in products],
+                    )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        if not products:
+            return
+        add_items(products)
+
+    report.accepted += len(products)
+    report.batches += 1
+
+
+async def ingest(stream, fmt: str, db, batch_size: int = 1000) -> dict:
+    report = IngestReport()
+    batch = []
+    async for number, record in iter_records(stream, fmt):
+        if isinstance(record, Exception):
+            report.reject(number, str(record))
+            continue
+        batch.append((number, record))
+        if len(batch) >= batch_size:
+            await apply_batch(batch, db, report)
+            batch = []
+    if batch:
+        await apply_batch(batch, db, report)
+    if report.accepted and db is not None:
+        # apply_batch only updated this process's catalog: publish the import
+        # to every worker (their watchers reload the new snapshot)
+        async with write_lock:
+            await rebuild_snapshot(db)
+    return report.to_dict()
+
+
+async def rebuild_snapshot(db):
+    """Rewrite the catalog snapshot from the SQLite catalog (which has the
+    bulk-imported products) and reload it. Hold `write_lock` when serving."""
+    async with db.execute("SELECT id, name, price, description FROM products ORDER BY id") as rows:
+        products = [Product(**dict(row)) for row in await rows.fetchall()]
+    await asyncio.to_thread(save_snapshot, products)
+    return await asyncio.to_thread(reload_catalog)
+
+
+async def sync_snapshot(db):
+    """At startup: rebuild the snapshot if SQLite has products it lacks.
+
+    Imports only ever add rows to SQLite, and it was seeded from the
+    snapshot, so comparing the counts is enough."""
+    async with db.execute("SELECT COUNT(*) FROM products") as cursor:
+        (count,) = await cursor.fetchone()
+    if count != len(get_catalog()):
+        await rebuild_snapshot(db)
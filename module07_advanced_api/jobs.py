@@ -0,0 +1,220 @@
+import asyncio
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class JobQueue:
+    """Persistent job queue stored in a SQLite file.
+
+    A job goes queued -> running -> done, or back to queued with an
+    exponential backoff when its handler fails, until `max_attempts` is
+    reached (-> failed). A claimed job is leased for `visibility_timeout`
+    seconds; if the worker crashes or hangs, the lease expires and another
+    worker picks the job up again. Jobs survive restarts of the app.
+    """
+
+    def __init__(self, path: str = "jobs.db", visibility_timeout: float = 30.0,
+                 max_attempts: int = 5, backoff_base: float = 1.0, backoff_max: float = 300.0):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " name TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'queued',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " run_at REAL NOT NULL,"
+            " locked_until REAL,"
+            " lease TEXT,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " finished_at REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_run_at ON jobs (status, run_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_finished_at ON jobs (finished_at)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, name: str, payload: dict, max_attempts: int = None) -> int:
+        now = time.time()
+        cur = self._connect().execute(
+            "INSERT INTO jobs (name, payload, max_attempts, run_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (name, json.dumps(payload), max_attempts or self.max_attempts, now, now),
+        )
+        return cur.lastrowid
+
+    def claim(self):
+        """Lease the next due job, or return None when nothing is due."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases with no attempts left are given up on
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, last_error = 'visibility timeout expired'"
+                " WHERE status = 'running' AND locked_until < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_until = ?, lease = ?"
+                " WHERE id = ("
+                "   SELECT id FROM jobs"
+                "   WHERE (status = 'queued' AND run_at <= ?) OR (status = 'running' AND locked_until < ?)"
+                "   ORDER BY run_at, id LIMIT 1)"
+                " RETURNING *",
+                (now + self.visibility_timeout, uuid.uuid4().hex, now, now),
+            ).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def complete(self, job: dict) -> bool:
+        """Mark a job done. False if the lease was lost (the job was re-claimed)."""
+        cur = self._connect().execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, locked_until = NULL, last_error = NULL"
+            " WHERE id = ? AND lease = ? AND status = 'running'",
+            (time.time(), job["id"], job["lease"]),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job: dict, error: str) -> bool:
+        now = time.time()
+        if job["attempts"] >= job["max_attempts"]:
+            cur = self._connect().execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, locked_until = NULL, last_error = ?"
+                " WHERE id = ? AND lease = ? AND status = 'running'",
+                (now, error, job["id"], job["lease"]),
+            )
+        else:
+            delay = min(self.backoff_base * 2 ** (job["attempts"] - 1), self.backoff_max)
+            cur = self._connect().execute(
+                "UPDATE jobs SET status = 'queued', run_at = ?, locked_until = NULL, last_error = ?"
+                " WHERE id = ? AND lease = ? AND status = 'running'",
+                (now + delay, error, job["id"], job["lease"]),
+            )
+        return cur.rowcount == 1
+
+    def get(self, job_id: int):
+        row = self._connect().execute(
+            "SELECT id, name, payload, status, attempts, max_attempts, run_at, last_error, created_at, finished_at"
+            " FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def metrics(self, window: float = 60.0) -> dict:
+        conn = self._connect()
+        counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        since = time.time() - window
+        done, avg_latency = conn.execute(
+            "SELECT COUNT(*), AVG(finished_at - created_at) FROM jobs"
+            " WHERE status = 'done' AND finished_at >= ?",
+            (since,),
+        ).fetchone()
+        return {
+            "counts": counts,
+            "throughput_per_sec": round(done / window, 3),
+            "avg_latency_sec": round(avg_latency, 4) if avg_latency is not None else None,
+        }
+
+
+class WorkerPool:
+    """`concurrency` asyncio workers pulling jobs from a `JobQueue`.
+
+    `handlers` maps a job name to a function taking the job payload; async
+    handlers run on the loop, sync ones in a thread. A handler running
+    longer than the visibility timeout is cancelled and retried.
+
+    Job state (status, attempts, errors) lives in the SQLite queue and is
+    shared by every process; `metrics()` only counts this pool's work."""
+
+    def __init__(self, queue: JobQueue, handlers: dict, concurrency: int = 2, poll_interval: float = 0.5):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks = []
+        self._stopping = asyncio.Event()
+        self.processed = 0
+        self.failed = 0
+        self.started_at = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        """Let running jobs finish, then stop the workers."""
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        while not self._stopping.is_set():
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: dict):
+        handler = self.handlers.get(job["name"])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job {job['name']!r}")
+            if inspect.iscoroutinefunction(handler):
+                coro = handler(job["payload"])
+            else:
+                coro = asyncio.to_thread(handler, job["payload"])
+            await asyncio.wait_for(coro, timeout=self.queue.visibility_timeout)
+        except Exception as exc:
+            self.failed += 1
+            logging.warning("Job %s (%s) attempt %s failed: %r", job["id"], job["name"], job["attempts"], exc)
+            await asyncio.to_thread(self.queue.fail, job, repr(exc))
+        else:
+            self.processed += 1
+            await asyncio.to_thread(self.queue.complete, job)
+
+    def metrics(self) -> dict:
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "failed_attempts": self.failed,
+            "jobs_per_sec": round(self.processed / uptime, 3) if uptime else 0.0,
+        }
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import time
+
+
+class BatchedLogWriter:
+    """Single background task that appends lines to log files in batches.
+
+    - `write()` puts a line on a bounded queue; when the queue is full the
+      caller waits (backpressure) instead of memory growing without limit.
+      It returns a future that resolves once the line's batch is flushed
+      (and fsynced, with fsync="always"), or fails with the write's OSError.
+    - The writer drains up to `batch_size` lines at once, keeps the files
+      open and issues one write + flush per file per batch.
+    - `fsync`: "never" (leave it to the OS), "interval" (every
+      `fsync_interval` seconds while there is unsynced data, even if no
+      more lines arrive) or "always" (after every batch).
+    - `close()` drains everything still queued and fsyncs the files
+      (unless fsync="never") before returning.
+    - `write()` raises RuntimeError before `start()` and after `close()`.
+    """
+
+    def __init__(self, maxsize: int = 10_000, batch_size: int = 1_000,
+                 fsync: str = "interval", fsync_interval: float = 1.0):
+        if fsync not in ("never", "interval", "always"):
+            raise ValueError(f"Invalid fsync policy: {fsync!r}")
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._queue = None
+        self._task = None
+        self._files = {}
+        self._closed = False
+        self._unsynced = False  # written since the last fsync
+        self._last_fsync = time.monotonic()
+        self.lines_written = 0
+        self.batches_written = 0
+
+    async def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._closed = False
+            self._task = asyncio.create_task(self._run())
+
+    async def write(self, path: str, line: str) -> asyncio.Future:
+        if self._closed:
+            raise RuntimeError("BatchedLogWriter is closed")
+        if self._task is None:
+            raise RuntimeError("BatchedLogWriter is not started")
+        written = asyncio.get_running_loop().create_future()
+        await self._queue.put((path, line, written))
+        if self._task is None:  # closed while waiting for room in the queue
+            raise RuntimeError("BatchedLogWriter is closed")
+        return written
+
+    async def close(self):
+        if self._task is None:
+            return
+        self._closed = True
+        await self._queue.put(None)  # sentinel: everything before it gets written
+        await self._task
+        self._task = None
+        # Writers that were blocked on the full queue got in after the sentinel
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and not item[2].done():
+                item[2].set_exception(RuntimeError("BatchedLogWriter is closed"))
+        if self.fsync != "never":
+            try:
+                await asyncio.to_thread(self._fsync_files)
+            except OSError as exc:
+                logging.error("Failed to fsync log files: %s", exc)
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    async def _run(self):
+        while True:
+            if self._unsynced:
+                # Idle with unsynced data: fsync when the interval is up
+                timeout = self._last_fsync + self.fsync_interval - time.monotonic()
+                try:
+                    first = await asyncio.wait_for(self._queue.get(), max(timeout, 0))
+                except asyncio.TimeoutError:
+                    try:
+                        await asyncio.to_thread(self._fsync_files)
+                    except OSError as exc:
+                        logging.error("Failed to fsync log files: %s", exc)
+                        self._last_fsync = time.monotonic()  # retry after the next interval
+                    continue
+            else:
+                first = await self._queue.get()
+            batch = [first]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            stop = None in batch
+            lines = [item for item in batch if item is not None]
+            if lines:
+                # File IO happens off the event loop
+                try:
+                    failed = await asyncio.to_thread(self._write_batch, lines)
+                except OSError as exc:  # fsync failed: nothing in the batch is known to be durable
+                    failed = {path: exc for path, _, _ in lines}
+                for path, exc in failed.items():
+                    logging.error("Failed to write log lines to %s: %s", path, exc)
+                for path, _, written in lines:
+                    if written.done():  # the caller stopped waiting
+                        continue
+                    if path in failed:
+                        written.set_exception(failed[path])
+                    else:
+                        written.set_result(None)
+            if stop:
+                return
+
+    def _write_batch(self, lines) -> dict:
+        """Write and flush `lines`; returns {path: OSError} for the files that failed."""
+        by_path = {}
+        for path, line, _ in lines:
+            by_path.setdefault(path, []).append(line)
+
+        failed = {}
+        for path, path_lines in by_path.items():
+            try:
+                f = self._files.get(path)
+                if f is None:
+                    f = self._files[path] = open(path, "a", buffering=1 << 16)
+                f.write("".join(path_lines))
+                f.flush()
+            except OSError as exc:
+                failed[path] = exc
+                # Reopen next time rather than reuse a file in an unknown state
+                f = self._files.pop(path, None)
+                if f is not None:
+                    try:
+                        f.close()
+                    except OSError:
+                        pass
+
+        if self.fsync == "always" or (
+            self.fsync == "interval" and time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            self._fsync_files()
+        elif self.fsync == "interval":
+            self._unsynced = True
+
+        self.lines_written += sum(len(path_lines) for path, path_lines in by_path.items() if path not in failed)
+        self.batches_written += 1
+        return failed
+
+    def _fsync_files(self):
+        for f in self._files.values():
+            os.fsync(f.fileno())
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
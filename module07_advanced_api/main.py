@@ -1,30 +1,34 @@
-from fastapi import FastAPI, BackgroundTasks, Form
+from fastapi import FastAPI, Form, HTTPException
 from routers import products_v1 as products_v1
 from routers import products_v2 as products_v2
 
-from models.product import fill_items_list
-from datetime import datetime
-from functools import lru_cache
+from models.product import load_catalog, get_catalog, watch_catalog
+import database
+from ingest import sync_snapshot
+from cache import ttl_cache
+from jobs import WorkerPool
+from tasks import HANDLERS, job_queue, log_writer
+import asyncio
+import os
 import time
 
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from fastapi import Depends
+from rate_limit import RateLimiter, RateLimitExceeded, create_backend
+import math
 
 
 app = FastAPI()
 
 ## Excercise 3.
 # Create the rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
-# Initialize FastAPI app and register rate limiter
+# Sliding-window counters with sharded locks and idle-key eviction;
+# set RATE_LIMIT_BACKEND=sqlite to share the counters between uvicorn workers.
+limiter = RateLimiter(backend=create_backend())
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 # Custom rate limit exceeded handler
@@ -34,13 +38,13 @@ async def custom_rate_limit_handler(request: Request, exc: RateLimitExceeded):
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "detail": "Rate limit exceeded. Please try again in a minute."
-        }
+        },
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
     )
 # Apply rate limit to sensitive /login/ route
 
 
-@app.get("/limited/")
-@limiter.limit("5/minute")
+@app.get("/limited/", dependencies=[Depends(limiter.limit("5/minute"))])
 async def login(request: Request):
     return {"message": "Limited endpoint: 5 requests per minutes."}
 
@@ -51,31 +55,37 @@ async def login(request: Request):
 #     - Create a POST route /send-email/ that accepts an email address.
 #     - Simulate email sending with a background task that logs the address to a file.
 #     - Return immediately with a success message.
+#
+# Instead of BackgroundTasks (lost on restart/crash, run inside the API worker),
+# the email is stored as a job in a durable SQLite queue (see `jobs.py`) and
+# processed by a worker pool with retries: in-process (JOB_WORKERS, default 2)
+# and/or in separate `python worker.py` processes. The tasks live in `tasks.py`.
+
+worker_pool = WorkerPool(job_queue, HANDLERS, concurrency=int(os.getenv("JOB_WORKERS", 2)))
 
-# Simulated email sending task
-def log_email_to_file(email: str):
-    with open("email.log", "a") as f:
-        f.write(f"{datetime.now()} - Sent email to: {email}\n")
-
-@app.post("/send-email/")
-async def send_email(
-    background_tasks: BackgroundTasks,
-    email: str = Form(...)
-):
-    # Schedule the email task
-    background_tasks.add_task(log_email_to_file, email)
-    
-     # Schedule admin notification task
-    background_tasks.add_task(notify_admin, email)
+@app.post("/send-email/", status_code=status.HTTP_202_ACCEPTED)
+async def send_email(email: str = Form(...)):
+    # Schedule the email job (email + admin notification)
+    job_id = await asyncio.to_thread(job_queue.enqueue, "send_email", {"email": email})
 
     # Return response immediately
-    return {"message": f"Email to {email} is being processed."}
+    return {"message": f"Email to {email} is being processed.", "job_id": job_id}
+
 
+@app.get("/jobs/metrics")
+async def jobs_metrics():
+    return {
+        "queue": await asyncio.to_thread(job_queue.metrics),
+        "workers": worker_pool.metrics()
+    }
 
-# Simulate notifying an admin
-def notify_admin(email: str):
-    with open("admin_notifications.log", "a") as f:
-        f.write(f"{datetime.now()} - Admin notified of email to: {email}\n")
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 ## Excercise 5.
 # - Objective: Cache expensive or frequently called endpoints.
@@ -83,27 +93,64 @@ def notify_admin(email: str):
 #   - Create an endpoint `/stats/` that simulates a slow operation (e.g., sleep for 3s).
 #   - Use `lru_cache` to cache the result for repeated calls.
 #   - Return the same result instantly for subsequent calls.
+#
+# `ttl_cache` replaces `lru_cache`: values expire after `ttl` seconds, stale
+# values are served for `stale_ttl` more seconds while being refreshed in the
+# background, and concurrent cold callers share a single computation.
 
 # Simulate slow computation
-@lru_cache(maxsize=1)
+@ttl_cache(ttl=60, stale_ttl=300, maxsize=1)
 def get_expensive_stats():
     time.sleep(3)  # Simulated delay
     return {"users": 1500, "sales": 234, "active": 87}
 
 
 @app.get("/stats/")
-def read_stats():
+async def read_stats():
+    data, status = await get_expensive_stats.get_with_status()
     return {
-        "cached": True,
-        "data": get_expensive_stats()
+        "cached": status in ("hit", "stale"),
+        "cache_status": status,
+        "data": data,
+        "cache": get_expensive_stats.cache_info()
     }
 
 
+@app.post("/refresh-stats/")
+async def refresh_stats():
+    get_expensive_stats.cache_clear()
+    return {"message": "Stats cache cleared."}
+
+
 
 # Initialize FastAPI application
 @app.on_event("startup")
 async def startup_event():
-    fill_items_list()
+    # Memory-mapped catalog snapshot (built on the first run)
+    load_catalog(os.getenv("CATALOG_SNAPSHOT", "catalog.snapshot"))
+    # v2 catalog: SQLite + FTS5, seeded from the in-memory list on first run
+    await database.connect(get_catalog())
+    # Bulk imports only reach SQLite and the running worker's catalog: bring
+    # the snapshot up to date so a restart doesn't lose them in v1
+    await sync_snapshot(database.db)
+    # Reload the catalog when the snapshot file is replaced (e.g. by another worker)
+    app.state.catalog_watcher = asyncio.ensure_future(
+        watch_catalog(float(os.getenv("CATALOG_WATCH_INTERVAL", 2)))
+    )
+    await log_writer.start()
+    if worker_pool.concurrency > 0:
+        worker_pool.start()
+    # Warm the stats cache in the background; early requests join this computation
+    asyncio.ensure_future(get_expensive_stats())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.catalog_watcher.cancel()
+    # Finish running jobs, then write out everything still queued
+    await worker_pool.stop()
+    await log_writer.close()
+    await database.disconnect()
 
 
 app.include_router(products_v1.router, prefix="/api/v1/products")
@@ -0,0 +1,56 @@
+def category_of(name: str) -> str:
+    """'Book with title: Egri csillagok' -> 'Book', 'Fruit: Fruit 51' -> 'Fruit'"""
+    prefix, sep, _ = name.partition(":")
+    if not sep or not prefix.strip():
+        return "Other"
+    return prefix.split()[0]
+
+
+class RunningStats:
+    """count/sum/min/max of one category, updated per insert. The catalog
+    only ever grows (a reload rebuilds the aggregates from scratch), so no
+    removal support is needed."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, price: float):
+        self.count += 1
+        self.total += price
+        if self.min is None or price < self.min:
+            self.min = price
+        if self.max is None or price > self.max:
+            self.max = price
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "min_price": self.min,
+            "max_price": self.max,
+            "mean_price": round(self.total / self.count, 4) if self.count else None,
+        }
+
+
+class CatalogAggregates:
+    """Per-category price statistics maintained incrementally, so reading
+    them costs O(categories) however large the catalog is."""
+
+    def __init__(self, products=()):
+        self.categories = {}
+        for product in products:
+            self.add(product)
+
+    def add(self, product):
+        category = category_of(product.name)
+        stats = self.categories.get(category)
+        if stats is None:
+            stats = self.categories[category] = RunningStats()
+        stats.add(product.price)
+
+    def summary(self) -> dict:
+        return {category: stats.summary() for category, stats in sorted(self.categories.items())}
@@ -1,3 +1,14 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Optional
+from pydantic import BaseModel
+
+from models.aggregates import CatalogAggregates
+from models.snapshot import MappedProducts, write_snapshot
+
+
 class Product:
     def __init__(self, id: int, name: str, price: float, description: str = None):
         self.id = id
@@ -16,15 +27,171 @@ class Product:
             "description": self.description
         }
     
-items = [
+class ProductIn(BaseModel):
+    id: int
+    name: str
+    price: float
+    description: Optional[str] = None
+
+    def to_product(self):
+        return Product(id=self.id, name=self.name, price=self.price, description=self.description)
+
+
+class Catalog:
+    """An immutable, versioned view of the product list: a `base` (a list,
+    or a memory-mapped snapshot shared by all worker processes) plus the
+    products added since. Supports len(), indexing, slicing and iteration.
+
+    Readers call `get_catalog()` once per request and keep using that
+    object; writers never change it, they publish a new Catalog instead
+    (copy-on-write). So the read path needs no locks.
+
+    `aggregates` holds the per-category price statistics of this version."""
+
+    __slots__ = ("version", "base", "extra", "aggregates", "_extra_by_id", "_base_by_id")
+
+    def __init__(self, version: int, base=(), extra=(), extra_by_id=None, aggregates=None):
+        self.version = version
+        self.base = base
+        self.extra = tuple(extra)
+        self.aggregates = aggregates
+        self._extra_by_id = extra_by_id if extra_by_id is not None else {p.id: p for p in self.extra}
+        self._base_by_id = None
+
+    def __len__(self):
+        return len(self.base) + len(self.extra)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                split = len(self.base)
+                return list(self.base[start:min(stop, split)]) + list(self.extra[max(start - split, 0):max(stop - split, 0)])
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if index < len(self.base):
+            return self.base[index]
+        return self.extra[index - len(self.base)]
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.extra
+
+    def get(self, product_id: int):
+        product = self._extra_by_id.get(product_id)
+        if product is not None:
+            return product
+        if isinstance(self.base, MappedProducts):
+            position = self.base.position(product_id)
+            return None if position is None else self.base[position]
+        if self._base_by_id is None:
+            # Benign race: two readers may both build the same dict
+            self._base_by_id = {product.id: product for product in self.base}
+        return self._base_by_id.get(product_id)
+
+    def with_products(self, products, aggregates=None):
+        """New version with `products` appended. Callers make sure the ids are new."""
+        extra_by_id = dict(self._extra_by_id)
+        for product in products:
+            extra_by_id[product.id] = product
+        return Catalog(self.version + 1, self.base, self.extra + tuple(products), extra_by_id, aggregates)
+
+
+_products = [
     Product(id=1, name="Book with title: Egri csillagok", price=50.0, description="A historical novel by Géza Gárdonyi."),
     Product(id=2, name="Book with title: A Pál utcai fiúk", price=45.0, description="A novel by Ferenc Molnár about a group of boys"),
     Product(id=3, name="Book with title: A kis herceg", price=60.0, description="A novel by Antoine de Saint-Exupéry about a young prince"),
 ]
+# Running per-category aggregates of the latest version, owned by the writers
+_aggregates = CatalogAggregates(_products)
+_catalog = Catalog(0, _products, aggregates=_aggregates.summary())
+# Serializes writers only; readers never take it
+_write_lock = threading.Lock()
+_snapshot_path = None
+_snapshot_stat = None
+
+
+def get_catalog() -> Catalog:
+    return _catalog
+
+
+def _publish(catalog: Catalog):
+    global _catalog
+    _catalog = catalog  # a single reference assignment: readers see the old or the new version
+
 
 def fill_items_list():
-    for i in range(4, 51):
-        items.append(Product(id=i, name=f"Book with title: Book {i}", price=20.0 + i, description=f"Description for book {i}"))
-    for i in range(51, 101):
-        items.append(Product(id=i, name=f"Fruit: Fruit {i}", price=1.0 + i, description=f"Description for fruit {i}"))
+    add_items([Product(id=i, name=f"Book with title: Book {i}", price=20.0 + i, description=f"Description for book {i}") for i in range(4, 51)])
+    add_items([Product(id=i, name=f"Fruit: Fruit {i}", price=1.0 + i, description=f"Description for fruit {i}") for i in range(51, 101)])
+
+def add_items(products):
+    with _write_lock:
+        for product in products:
+            _aggregates.add(product)
+        _publish(_catalog.with_products(products, _aggregates.summary()))
+
+
+def get_aggregates() -> dict:
+    """count/min/max/mean price per category of the current catalog.
+
+    Built with one scan when a snapshot is (re)loaded, then kept up to
+    date by `add_items`, so reading them costs nothing per request."""
+    return _catalog.aggregates
+
+
+def _stat_key(path: str):
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def load_catalog(snapshot_path: str):
+    """Map the catalog snapshot if there is one; otherwise build the catalog
+    with `fill_items_list()`, save it as a snapshot and map that, so every
+    worker process reads the same pages."""
+    global _snapshot_path
+    _snapshot_path = snapshot_path
+    if not os.path.exists(snapshot_path):
+        fill_items_list()
+        write_snapshot(snapshot_path, _catalog)
+    reload_catalog()
+
+
+def reload_catalog() -> Catalog:
+    """Map the snapshot file again and swap it in as a new version.
+    Products added since the previous snapshot are dropped, so write them
+    into the new snapshot first (see `save_snapshot`)."""
+    global _snapshot_stat, _aggregates
+    stat = _stat_key(_snapshot_path)
+    base = MappedProducts(_snapshot_path, Product)
+    # The one scan per load happens here, outside the lock, rather than in a request
+    aggregates = CatalogAggregates(base)
+    with _write_lock:
+        _aggregates = aggregates
+        # Requests still holding the old version keep its mapping alive;
+        # it is unmapped once the last of them lets go of it.
+        _publish(Catalog(_catalog.version + 1, base, aggregates=aggregates.summary()))
+        _snapshot_stat = stat
+        return _catalog
+
+
+def save_snapshot(products):
+    """Write `products` as the new snapshot file (watchers in every worker pick it up)."""
+    write_snapshot(_snapshot_path, products)
+
 
+async def watch_catalog(interval: float = 2.0):
+    """Reload the catalog whenever the snapshot file is replaced."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = _stat_key(_snapshot_path) != _snapshot_stat
+        except FileNotFoundError:
+            continue
+        if changed:
+            try:
+                catalog = await asyncio.to_thread(reload_catalog)
+                logging.info("Catalog reloaded from %s (version %s, %s products)",
+                             _snapshot_path, catalog.version, len(catalog))
+            except (OSError, ValueError):
+                logging.exception("Could not reload the catalog from %s", _snapshot_path)
@@ -0,0 +1,134 @@
+import bisect
+import mmap
+import sys
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+
+
+# Binary catalog snapshot
+# -----------------------
+# header   magic, format version, flags, row count, offsets of the sections below
+# ids      int64[count]
+# prices   float64[count]
+# strings  uint64[2 * count + 1]  heap offsets: row i's name is heap[s[2i]:s[2i+1]],
+#                                its description heap[s[2i+1]:s[2i+2]]
+# nulls    uint8[count]        1 if the description is None (padded to 8 bytes)
+# heap     UTF-8 strings
+#
+# Columns use the host's byte order (checked on load), so they can be cast
+# to typed memoryviews without copying.
+#
+# Every section is fixed-width except the heap, so row i is found by
+# arithmetic and columns are read straight from the mapped pages. The file is
+# mapped read-only: all uvicorn workers on a host share one copy in the page
+# cache and startup only has to read the header.
+
+MAGIC = b"PCAT"
+FORMAT_VERSION = 1
+FLAG_SORTED_IDS = 1
+FLAG_BIG_ENDIAN = 2
+HEADER = struct.Struct("<4sHHQQQQQQ")
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_snapshot(path: str, products) -> int:
+    """Write `products` to `path` atomically (temp file + rename)."""
+    ids, prices, strings, nulls = array("q"), array("d"), array("Q", [0]), bytearray()
+    heap = bytearray()
+    for product in products:
+        ids.append(product.id)
+        prices.append(product.price)
+        heap += product.name.encode()
+        strings.append(len(heap))
+        if product.description is None:
+            nulls.append(1)
+        else:
+            nulls.append(0)
+            heap += product.description.encode()
+        strings.append(len(heap))
+
+    count = len(ids)
+    flags = FLAG_SORTED_IDS if all(a < b for a, b in zip(ids, ids[1:])) else 0
+    if sys.byteorder == "big":
+        flags |= FLAG_BIG_ENDIAN
+    ids_off = HEADER.size
+    prices_off = ids_off + 8 * count
+    strings_off = prices_off + 8 * count
+    nulls_off = strings_off + 8 * (2 * count + 1)
+    heap_off = nulls_off + _pad8(count)
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, count,
+                            ids_off, prices_off, strings_off, nulls_off, heap_off))
+        f.write(ids.tobytes())
+        f.write(prices.tobytes())
+        f.write(strings.tobytes())
+        f.write(bytes(nulls) + b"\0" * (_pad8(count) - count))
+        f.write(heap)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return count
+
+
+class MappedProducts(Sequence):
+    """Read-only sequence of `Product`s backed by a memory-mapped snapshot.
+    Products are decoded on access; nothing is loaded up front."""
+
+    def __init__(self, path: str, product_class):
+        self.path = path
+        self._product = product_class
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, flags, count, ids_off, prices_off,
+         strings_off, nulls_off, heap_off) = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a catalog snapshot (version {FORMAT_VERSION})")
+        if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+            self._mm.close()
+            raise ValueError(f"{path} was written on a host with a different byte order")
+        view = memoryview(self._mm)
+        self._count = count
+        self._sorted = bool(flags & FLAG_SORTED_IDS)
+        self.ids = view[ids_off:ids_off + 8 * count].cast("q")
+        self.prices = view[prices_off:prices_off + 8 * count].cast("d")
+        self._strings = view[strings_off:strings_off + 8 * (2 * count + 1)].cast("Q")
+        self._nulls = view[nulls_off:nulls_off + count]
+        self._heap = view[heap_off:]
+        self._positions = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("snapshot index out of range")
+        start, middle, end = self._strings[2 * index:2 * index + 3]
+        name = str(self._heap[start:middle], "utf-8")
+        description = None if self._nulls[index] else str(self._heap[middle:end], "utf-8")
+        return self._product(id=self.ids[index], name=name, price=self.prices[index], description=description)
+
+    def position(self, product_id: int):
+        """Row of `product_id`, or None. Binary search when ids are sorted."""
+        if self._sorted:
+            i = bisect.bisect_left(self.ids, product_id)
+            return i if i < self._count and self.ids[i] == product_id else None
+        if self._positions is None:
+            self._positions = {pid: i for i, pid in enumerate(self.ids)}
+        return self._positions.get(product_id)
+
+    def close(self):
+        for view in (self.ids, self.prices, self._strings, self._nulls, self._heap):
+            view.release()
+        self._mm.close()
@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from fastapi import Request
+
+
+# Sliding-window counter
+# ----------------------
+# Each key keeps the hit count of the current fixed window and of the previous
+# one. The number of hits in the sliding window ending "now" is estimated as
+#
+#     previous * (1 - elapsed / window) + current
+#
+# which needs O(1) memory per key (no per-request timestamps).
+
+UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str):
+    """'5/minute' -> (5, 60.0)"""
+    count, _, unit = rate.partition("/")
+    unit = unit.strip().rstrip("s")
+    if unit not in UNITS:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    return int(count), float(UNITS[unit])
+
+
+def sliding_window_hit(state, limit: int, window: float, now: float):
+    """Apply one hit to `state` = (window_start, previous, current).
+
+    Returns (allowed, new_state, remaining, retry_after)."""
+    window_start, previous, current = state
+    current_start = now - (now % window)
+    if current_start != window_start:
+        previous = current if current_start - window_start == window else 0
+        current = 0
+        window_start = current_start
+
+    elapsed = now - current_start
+    weight = (window - elapsed) / window
+    estimated = previous * weight + current
+
+    if estimated + 1 > limit:
+        if previous and current < limit:
+            # Time until enough of the previous window has slid out
+            retry_after = (window - elapsed) - (limit - current - 1) * window / previous
+        else:
+            retry_after = window - elapsed
+        return False, (window_start, previous, current), 0, max(retry_after, 0.0)
+
+    current += 1
+    remaining = max(int(limit - (estimated + 1)), 0)
+    return True, (window_start, previous, current), remaining, 0.0
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, limit: str, retry_after: float):
+        self.limit = limit
+        self.retry_after = retry_after
+        super().__init__(f"Rate limit exceeded: {limit}")
+
+
+# Backends
+# --------
+
+class _Shard:
+    __slots__ = ("lock", "entries")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> [window_start, previous, current, last_seen]
+
+
+class MemoryBackend:
+    """In-process backend.
+
+    Keys are spread over `shards` independently locked shards, so concurrent
+    requests for different clients rarely contend. Each shard is kept in
+    last-seen order: idle keys (not seen for two windows) and keys beyond
+    `max_keys` are evicted from the front, so memory stays bounded no matter
+    how many distinct clients show up."""
+
+    def __init__(self, shards: int = 64, max_keys: int = 100_000):
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_per_shard = max(max_keys // shards, 1)
+        self.evictions = 0
+
+    def _shard(self, key: str):
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def hit(self, key: str, limit: int, window: float, now: float):
+        shard = self._shard(key)
+        with shard.lock:
+            entries = shard.entries
+            entry = entries.get(key)
+            if entry is None:
+                state = (0.0, 0, 0)
+            else:
+                state = (entry[0], entry[1], entry[2])
+                entries.move_to_end(key)
+
+            allowed, state, remaining, retry_after = sliding_window_hit(state, limit, window, now)
+            entries[key] = [state[0], state[1], state[2], now]
+
+            # Oldest entries are at the front: drop idle ones and overflow
+            idle_before = now - 2 * window
+            while entries:
+                oldest_key, oldest = next(iter(entries.items()))
+                if len(entries) > self._max_per_shard or oldest[3] < idle_before:
+                    del entries[oldest_key]
+                    self.evictions += 1
+                else:
+                    break
+        return allowed, remaining, retry_after
+
+    def __len__(self):
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+class SQLiteBackend:
+    """Backend shared by every worker process on the host via a SQLite file.
+
+    Each hit is one short `BEGIN IMMEDIATE` transaction, so all uvicorn
+    workers see the same counters. Idle keys are purged every
+    `cleanup_every` hits."""
+
+    def __init__(self, path: str = "rate_limit.db", cleanup_every: int = 10_000):
+        self.path = path
+        self.cleanup_every = cleanup_every
+        self._local = threading.local()
+        self._hits = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY,"
+                " window_start REAL NOT NULL,"
+                " previous INTEGER NOT NULL,"
+                " current INTEGER NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_last_seen ON rate_limits (last_seen)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: we issue BEGIN/COMMIT ourselves
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: int, window: float, now: float):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_start, previous, current FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            allowed, state, remaining, retry_after = sliding_window_hit(
+                row or (0.0, 0, 0), limit, window, now
+            )
+            conn.execute(
+                "INSERT INTO rate_limits (key, window_start, previous, current, last_seen)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET window_start = excluded.window_start,"
+                " previous = excluded.previous, current = excluded.current, last_seen = excluded.last_seen",
+                (key, state[0], state[1], state[2], now),
+            )
+            self._hits += 1
+            if self._hits % self.cleanup_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE last_seen < ?", (now - 2 * window,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, remaining, retry_after
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+# FastAPI integration
+# -------------------
+
+def get_remote_address(request: Request) -> str:
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class RateLimiter:
+    def __init__(self, backend=None, key_func=get_remote_address):
+        self.backend = backend or MemoryBackend()
+        self.key_func = key_func
+
+    def limit(self, rate: str, scope: str = None):
+        """Return a dependency enforcing `rate` (e.g. "5/minute") per client.
+
+        The dependency is a plain function, so FastAPI runs it in the
+        threadpool; the sharded locks keep those threads from serializing."""
+        limit, window = parse_rate(rate)
+
+        def dependency(request: Request):
+            key = f"{scope or request.url.path}:{self.key_func(request)}"
+            allowed, remaining, retry_after = self.backend.hit(key, limit, window, time.time())
+            request.state.rate_limit_remaining = remaining
+            if not allowed:
+                raise RateLimitExceeded(rate, retry_after)
+
+        return dependency
+
+
+def create_backend():
+    """Pick the backend from RATE_LIMIT_BACKEND ('memory' or 'sqlite')."""
+    if os.getenv("RATE_LIMIT_BACKEND", "memory") == "sqlite":
+        return SQLiteBackend(os.getenv("RATE_LIMIT_DB", "rate_limit.db"))
+    return MemoryBackend(max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", 100_000)))
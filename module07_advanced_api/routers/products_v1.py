@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException
-from models.product import items
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
+from models.product import get_aggregates, get_catalog, reload_catalog
+from database import get_db
+from ingest import ingest, IngestError, rebuild_snapshot, write_lock
+from fields import parse_fields
 
 router = APIRouter()
 
 
 # skip and limit parameters for pagination
+# fields: comma separated subset of id,name,price,description (sparse fieldset)
 @router.get("/")
-def get_items(skip:int=0, limit:int=100, filter:str=None, sortby:str=None):
+def get_items(skip:int=0, limit:int=100, filter:str=None, sortby:str=None, fields:str=None):
+    selected_fields = parse_fields(fields, ("id", "name", "price", "description"))
+    items = get_catalog()  # one consistent version for the whole request
     selected = items[ skip: skip + limit] if skip < len(items) else []
     if filter:
         selected = [item for item in selected if filter.lower() in item.name.lower()]
@@ -18,4 +26,47 @@ def get_items(skip:int=0, limit:int=100, filter:str=None, sortby:str=None):
         else:
             raise HTTPException(status_code=400, detail="Invalid sort_by parameter. Use 'name' or 'price'.")
 
+    if selected_fields:
+        return [{field: getattr(item, field) for field in selected_fields} for item in selected]
     return selected
+
+
+
+# count/min/max/mean price per category (the prefix of the product name,
+# e.g. "Book", "Fruit"), maintained incrementally as products are added
+@router.get("/aggregates")
+def get_items_aggregates():
+    return get_aggregates()
+
+
+# Streaming bulk import: NDJSON (one JSON object per line) or CSV with a
+# header row (id,name,price,description). The body is parsed while it is
+# received and applied in batches of `batch_size` rows.
+@router.post("/bulk")
+async def bulk_import(request: Request, batch_size: int = Query(1000, ge=1, le=10000), db=Depends(get_db)):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        fmt = "ndjson"
+    elif content_type in ("text/csv", "application/csv"):
+        fmt = "csv"
+    else:
+        raise HTTPException(status_code=415, detail="Use Content-Type application/x-ndjson or text/csv")
+
+    try:
+        return await ingest(request.stream(), fmt, db, batch_size=batch_size)
+    except (IngestError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# Hot reload: swap in a new catalog version without blocking readers.
+# With rebuild=true the snapshot is first rewritten from the SQLite catalog,
+# so it includes bulk-imported products; other workers pick up the new file
+# through their file watcher.
+@router.post("/reload")
+async def reload_items(rebuild: bool = False, db=Depends(get_db)):
+    async with write_lock:
+        if rebuild:
+            catalog = await rebuild_snapshot(db)
+        else:
+            catalog = await asyncio.to_thread(reload_catalog)
+    return {"version": catalog.version, "count": len(catalog)}
@@ -1,9 +1,116 @@
-from fastapi import APIRouter, HTTPException
-import models
+import base64
+import json
+import math
+import re
+
+import aiosqlite
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from database import get_db
+from fields import parse_fields
 
 router = APIRouter()
 
+COLUMNS = ("id", "name", "price", "description")
+
+
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+# SQLite integers are 64-bit: binding anything larger raises OverflowError
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and _INT64_MIN <= value <= _INT64_MAX
+
+
+def _is_score(value) -> bool:
+    return _is_int(value) or (isinstance(value, float) and math.isfinite(value))
 
+
+def decode_cursor(cursor: str, searching: bool) -> list:
+    """Decode a cursor from `encode_cursor`: `[score, id]` when searching,
+    `[id]` otherwise. Anything else (including a cursor from the other kind
+    of listing) is a 400."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if searching:
+        valid = (
+            isinstance(values, list) and len(values) == 2
+            and _is_score(values[0]) and _is_int(values[1])
+        )
+    else:
+        valid = isinstance(values, list) and len(values) == 1 and _is_int(values[0])
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def fts_query(q: str) -> str:
+    # Quote every word (no FTS syntax errors from user input) and match prefixes
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+# Keyset pagination: pass `next_cursor` from the previous page as `cursor`.
+# With `q`, results are ranked by bm25 (name matches weigh `name_weight`
+# times, description matches `description_weight` times).
+# `fields=id,price` selects only those columns (plus `score` when searching).
 @router.get("/")
-def get_items():
-    return "There are no items"
\ No newline at end of file
+async def get_items(
+    q: str = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    name_weight: float = 10.0,
+    description_weight: float = 1.0,
+    fields: str = None,
+    db: aiosqlite.Connection = Depends(get_db),
+):
+    match = fts_query(q) if q else None
+    if q and not match:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+
+    selected = parse_fields(fields, COLUMNS + ("score",) if match else COLUMNS)
+    # Only the requested columns are read; id (and score) are always needed for the cursor
+    columns = [c for c in (selected or COLUMNS) if c != "score"]
+    if "id" not in columns:
+        columns.insert(0, "id")
+
+    if match:
+        rank = "bm25(products_fts, ?, ?)"
+        sql = (
+            f"SELECT {', '.join('p.' + c for c in columns)}, {rank} AS score"
+            " FROM products_fts JOIN products p ON p.id = products_fts.rowid"
+            " WHERE products_fts MATCH ?"
+        )
+        params = [name_weight, description_weight, match]
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, searching=True)
+            sql += f" AND ({rank} > ? OR ({rank} = ? AND p.id > ?))"
+            params += [name_weight, description_weight, last_score,
+                       name_weight, description_weight, last_score, last_id]
+        sql += " ORDER BY score, p.id LIMIT ?"
+    else:
+        sql = f"SELECT {', '.join(columns)} FROM products"
+        params = []
+        if cursor:
+            (last_id,) = decode_cursor(cursor, searching=False)
+            sql += " WHERE id > ?"
+            params.append(last_id)
+        sql += " ORDER BY id LIMIT ?"
+    params.append(limit)
+
+    async with db.execute(sql, params) as rows:
+        items = [dict(row) for row in await rows.fetchall()]
+
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = encode_cursor([last["score"], last["id"]] if match else [last["id"]])
+    if selected:
+        items = [{field: item[field] for field in selected} for item in items]
+    return {"items": items, "next_cursor": next_cursor}
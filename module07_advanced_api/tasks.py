@@ -0,0 +1,43 @@
+import asyncio
+import os
+from datetime import datetime
+
+from jobs import JobQueue
+from log_writer import BatchedLogWriter
+
+
+# Durable job queue shared by the API (producer) and the workers (consumers)
+job_queue = JobQueue(
+    path=os.getenv("JOB_DB", "jobs.db"),
+    visibility_timeout=float(os.getenv("JOB_VISIBILITY_TIMEOUT", 30)),
+    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", 5)),
+)
+
+# Both tasks hand their line to a single background writer, which appends
+# queued lines in batches instead of opening the log file on every request.
+# A job only counts as done once its lines are on disk, so every batch is
+# fsynced (one fsync covers all the jobs in the batch).
+log_writer = BatchedLogWriter(maxsize=10_000, batch_size=1_000, fsync="always")
+
+
+# Simulated email sending task; the returned future resolves once the line is written
+async def log_email_to_file(email: str):
+    return await log_writer.write("email.log", f"{datetime.now()} - Sent email to: {email}\n")
+
+
+# Simulate notifying an admin
+async def notify_admin(email: str):
+    return await log_writer.write("admin_notifications.log", f"{datetime.now()} - Admin notified of email to: {email}\n")
+
+
+async def send_email_job(payload: dict):
+    written = [await log_email_to_file(payload["email"]), await notify_admin(payload["email"])]
+    # Wait for the lines to reach the disk: a failed write fails the job, which
+    # is then retried with backoff (a retry may log the email line again)
+    await asyncio.gather(*written)
+
+
+# Job name -> handler
+HANDLERS = {
+    "send_email": send_email_job,
+}
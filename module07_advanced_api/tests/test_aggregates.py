@@ -0,0 +1,61 @@
+import pytest
+
+from models import product as catalog
+from models.aggregates import CatalogAggregates
+from models.product import Product
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    """A catalog loaded from a fresh snapshot (restored after the test)."""
+    monkeypatch.setattr(catalog, "_catalog", catalog._catalog)
+    monkeypatch.setattr(catalog, "_aggregates", catalog._aggregates)
+    monkeypatch.setattr(catalog, "_snapshot_path", catalog._snapshot_path)
+    monkeypatch.setattr(catalog, "_snapshot_stat", catalog._snapshot_stat)
+    path = str(tmp_path / "catalog.snapshot")
+    catalog.load_catalog(path)
+    return path
+
+
+def test_category_statistics():
+    aggregates = CatalogAggregates([
+        Product(1, "Book with title: A", 10.0),
+        Product(2, "Book with title: B", 30.0),
+        Product(3, "Fruit: Apple", 2.0),
+        Product(4, "Unnamed", 5.0),
+    ])
+    assert aggregates.summary() == {
+        "Book": {"count": 2, "min_price": 10.0, "max_price": 30.0, "mean_price": 20.0},
+        "Fruit": {"count": 1, "min_price": 2.0, "max_price": 2.0, "mean_price": 2.0},
+        "Other": {"count": 1, "min_price": 5.0, "max_price": 5.0, "mean_price": 5.0},
+    }
+
+
+def test_loaded_catalog_has_aggregates(snapshot):
+    # Built at load time, not by the first request
+    assert catalog.get_catalog().aggregates is not None
+    summary = catalog.get_aggregates()
+    assert summary == CatalogAggregates(catalog.get_catalog()).summary()
+    assert summary["Book"]["count"] == 50
+    assert summary["Fruit"]["count"] == 50
+
+
+def test_added_products_update_aggregates(snapshot):
+    before = catalog.get_catalog()
+    catalog.add_items([Product(1000, "Fruit: Kiwi", 500.0), Product(1001, "Toy: Ball", 3.0)])
+    summary = catalog.get_aggregates()
+    assert summary["Fruit"]["count"] == 51
+    assert summary["Fruit"]["max_price"] == 500.0
+    assert summary["Toy"] == {"count": 1, "min_price": 3.0, "max_price": 3.0, "mean_price": 3.0}
+    assert summary == CatalogAggregates(catalog.get_catalog()).summary()
+    # The version readers already hold is unchanged
+    assert before.aggregates["Fruit"]["count"] == 50
+    assert catalog.get_catalog().get(1000).name == "Fruit: Kiwi"
+
+
+def test_reload_rebuilds_aggregates(snapshot):
+    catalog.add_items([Product(1000, "Toy: Ball", 3.0)])
+    catalog.save_snapshot([Product(1, "Toy: Car", 7.0), Product(2, "Toy: Kite", 9.0)])
+    catalog.reload_catalog()
+    assert catalog.get_aggregates() == {"Toy": {"count": 2, "min_price": 7.0, "max_price": 9.0, "mean_price": 8.0}}
+    assert catalog.get_catalog().get(1000) is None
@@ -0,0 +1,64 @@
+import asyncio
+
+from cache import ttl_cache
+
+
+def test_status_reports_hits_and_misses():
+    @ttl_cache(ttl=60)
+    async def compute():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def main():
+        first, second = await asyncio.gather(compute.get_with_status(), compute.get_with_status())
+        third = await compute.get_with_status()
+        return first, second, third
+
+    assert asyncio.run(main()) == ((1, "miss"), (1, "coalesced"), (1, "hit"))
+
+
+def test_result_computed_before_a_clear_is_not_stored():
+    version = 0
+
+    @ttl_cache(ttl=60)
+    async def compute():
+        seen = version
+        await asyncio.sleep(0.05)
+        return seen
+
+    async def main():
+        nonlocal version
+        outdated = asyncio.ensure_future(compute())
+        await asyncio.sleep(0.01)
+        version = 1
+        compute.cache_clear()
+        # Callers of the running computation still get its result...
+        assert await outdated == 0
+        # ...but it is not cached: the next call computes again
+        assert await compute.get_with_status() == (1, "miss")
+        assert await compute.get_with_status() == (1, "hit")
+
+    asyncio.run(main())
+
+
+def test_call_after_clear_does_not_join_the_outdated_computation():
+    calls = 0
+
+    @ttl_cache(ttl=60)
+    async def compute():
+        nonlocal calls
+        calls += 1
+        n = calls
+        await asyncio.sleep(0.02)
+        return n
+
+    async def main():
+        outdated = asyncio.ensure_future(compute())
+        await asyncio.sleep(0)
+        compute.cache_clear()
+        assert await compute() == 2
+        assert await outdated == 1
+        assert compute.cache_info()["inflight"] == 0
+        assert await compute.get_with_status() == (2, "hit")
+
+    asyncio.run(main())
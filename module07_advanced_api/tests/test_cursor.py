@@ -0,0 +1,35 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from routers.products_v2 import decode_cursor, encode_cursor
+
+
+def raw_cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+@pytest.mark.parametrize("values, searching", [([42], False), ([-7.25, 42], True), ([3, 42], True), ([2 ** 63 - 1], False)])
+def test_round_trip(values, searching):
+    assert decode_cursor(encode_cursor(values), searching) == values
+
+
+@pytest.mark.parametrize("cursor, searching", [
+    ("!!!", False),
+    (raw_cursor("5"), False),
+    (raw_cursor("[true]"), False),
+    (raw_cursor("[1, 2]"), False),     # a search cursor on a plain listing
+    (raw_cursor("[2]"), True),         # a plain cursor on a search
+    (raw_cursor("[1.5, \"x\"]"), True),
+    (raw_cursor(f"[{2 ** 63}]"), False),  # does not fit a SQLite integer
+    (raw_cursor(f"[1.0, {-2 ** 63 - 1}]"), True),
+    (raw_cursor(f"[{2 ** 64}, 1]"), True),
+    (raw_cursor("[Infinity, 1]"), True),
+    (raw_cursor("[NaN, 1]"), True),
+])
+def test_invalid_cursor_is_a_400(cursor, searching):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, searching)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid cursor"
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+import log_writer
+from log_writer import BatchedLogWriter
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """File descriptors passed to os.fsync."""
+    calls = []
+    fsync = log_writer.os.fsync
+
+    def record(fd):
+        calls.append(fd)
+        fsync(fd)
+
+    monkeypatch.setattr(log_writer.os, "fsync", record)
+    return calls
+
+
+# --- Tests ---
+def test_write_before_start_raises():
+    async def main():
+        writer = BatchedLogWriter()
+        with pytest.raises(RuntimeError, match="not started"):
+            await writer.write("unused.log", "line\n")
+
+    asyncio.run(main())
+
+
+def test_write_after_close_raises(tmp_path):
+    path = str(tmp_path / "app.log")
+
+    async def main():
+        writer = BatchedLogWriter()
+        await writer.start()
+        await (await writer.write(path, "first\n"))
+        await writer.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await writer.write(path, "second\n")
+
+    asyncio.run(main())
+    assert open(path).read() == "first\n"
+
+
+def test_close_writes_and_fsyncs_pending_lines(tmp_path, fsyncs):
+    path = str(tmp_path / "app.log")
+
+    async def main():
+        writer = BatchedLogWriter(fsync="interval", fsync_interval=3600)
+        await writer.start()
+        futures = [await writer.write(path, f"line {i}\n") for i in range(100)]
+        await writer.close()
+        assert all(f.done() and f.exception() is None for f in futures)
+        assert writer.lines_written == 100
+
+    asyncio.run(main())
+    assert len(open(path).readlines()) == 100
+    assert len(fsyncs) == 1
+
+
+def test_idle_writer_fsyncs_after_the_interval(tmp_path, fsyncs):
+    path = str(tmp_path / "app.log")
+
+    async def main():
+        writer = BatchedLogWriter(fsync="interval", fsync_interval=0.05)
+        await writer.start()
+        await (await writer.write(path, "line\n"))
+        assert fsyncs == []
+        # No more lines arrive: the writer still syncs once the interval is up
+        await asyncio.sleep(0.2)
+        assert len(fsyncs) == 1
+        await writer.close()
+
+    asyncio.run(main())
+
+
+def test_failed_write_fails_the_future(tmp_path):
+    async def main():
+        writer = BatchedLogWriter(fsync="always")
+        await writer.start()
+        ok = await writer.write(str(tmp_path / "app.log"), "line\n")
+        failed = await writer.write(str(tmp_path), "line\n")  # a directory
+        await ok
+        with pytest.raises(OSError):
+            await failed
+        await writer.close()
+        assert writer.lines_written == 1
+
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+"""Standalone job worker, so email sending scales independently of the API.
+
+Usage:
+    python worker.py [--concurrency 4]
+
+Run as many worker processes as needed; they share the SQLite job queue
+(JOB_DB) with the API. Start the API with JOB_WORKERS=0 to disable its
+in-process workers.
+"""
+import argparse
+import asyncio
+import signal
+
+from jobs import WorkerPool
+from tasks import HANDLERS, job_queue, log_writer
+
+
+async def main(concurrency: int):
+    await log_writer.start()
+    pool = WorkerPool(job_queue, HANDLERS, concurrency=concurrency)
+    pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"Worker started with {concurrency} workers, press Ctrl+C to stop")
+    await stop.wait()
+
+    await pool.stop()
+    await log_writer.close()
+    print(pool.metrics())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
@@ -0,0 +1,86 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from main import app, Base, get_db
+
+# --- Test database ---
+# One in-memory SQLite database per test process (so pytest-xdist workers never
+# share it). StaticPool hands every checkout the same connection, otherwise each
+# connection would see its own empty in-memory database.
+@pytest.fixture(scope="session")
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite defers BEGIN until the first write, which breaks SAVEPOINTs:
+    # let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+# --- Per-test session ---
+# Everything runs inside one outer transaction that is rolled back after the
+# test. session.commit() (in fixtures or in the app) only releases a SAVEPOINT,
+# so no data outlives the test.
+@pytest.fixture
+def db_session(engine):
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+# --- Client using the test session ---
+@pytest.fixture
+def client(db_session):
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+# --- Performance tests (tests/performance) ---
+# Skipped unless --perf is given, since timings need a quiet machine.
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance regression tests")
+    group.addoption("--perf", action="store_true", help="run the performance tests")
+    group.addoption("--perf-update", action="store_true", help="run the performance tests and save the results as the new baselines")
+    group.addoption("--perf-tolerance", type=float, default=0.25, help="allowed latency regression, as a fraction of the baseline (default 0.25)")
+    group.addoption("--perf-alloc-tolerance", type=float, default=0.10, help="allowed allocation regression, as a fraction of the baseline (default 0.10)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance regression test, run with --perf")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf") or config.getoption("--perf-update"):
+        return
+    skip = pytest.mark.skip(reason="performance test, run with --perf")
+    for item in items:
+        if item.get_closest_marker("perf"):
+            item.add_marker(skip)
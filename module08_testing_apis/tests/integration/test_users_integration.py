@@ -1,48 +1,47 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from main import app, Base, get_db, User
-
-# --- Setup test database ---
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create fresh schema
-Base.metadata.drop_all(bind=engine)
-Base.metadata.create_all(bind=engine)
-
-# --- Dependency override for tests ---
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# --- Override the dependency during tests --> Use test.db ---
-app.dependency_overrides[get_db] = override_get_db
-client = TestClient(app)
+from sqlalchemy.orm import Session
+
+from main import User
+
+# The `client` and `db_session` fixtures (tests/conftest.py) use an in-memory
+# database whose changes are rolled back after every test.
 
 # --- Fixtures ---
 @pytest.fixture
-def setup_test_data():
-    db = TestingSessionLocal()
+def setup_test_data(db_session):
     user = User(id=1, name="Integration Alice")
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    db.close()
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
     return user
 
 # --- Tests ---
-def test_read_user2_success(setup_test_data):
+def test_read_user2_success(client, setup_test_data):
     response = client.get(f"/users/integration/{setup_test_data.id}")
     assert response.status_code == 200
     assert response.json() == {"id": 1, "name": "Integration Alice"}
 
-def test_read_user2_not_found():
+def test_read_user2_not_found(client):
     response = client.get("/users/integration/999")
     assert response.status_code == 404
     assert response.json() == {"detail": "User not found"}
+
+@pytest.fixture
+def check_table_empty_after(engine):
+    # Requested before db_session, so this teardown runs after its rollback
+    yield
+    with Session(engine) as session:
+        assert session.query(User).count() == 0
+
+
+def test_committed_data_is_rolled_back(check_table_empty_after, client, db_session):
+    db_session.add(User(id=2, name="Committed Bob"))
+    db_session.commit()
+    # The commit only released a SAVEPOINT: the outer transaction is still open.
+    # (db_session.bind, not db_session.connection(), which would begin a new SAVEPOINT)
+    connection = db_session.bind
+    assert connection.in_transaction()
+    assert not connection.in_nested_transaction()
+    # The app (through the same session) sees the committed row until the test ends
+    response = client.get("/users/integration/2")
+    assert response.status_code == 200
@@ -0,0 +1,100 @@
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+import pytest
+
+from main import app
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+class Perf:
+    """Measures a callable and compares the result with its stored baseline.
+
+    Latency is the best mean over `rounds` rounds of `iterations` calls (the
+    least disturbed by the rest of the machine), in microseconds. Allocations
+    are the peak traced memory of one call, measured separately because
+    tracemalloc slows every allocation down."""
+
+    def __init__(self, config):
+        self.update = config.getoption("--perf-update")
+        self.tolerance = config.getoption("--perf-tolerance")
+        self.alloc_tolerance = config.getoption("--perf-alloc-tolerance")
+        self.baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+        self.results = {}
+
+    def measure(self, name, func, iterations=1000, rounds=5, warmup=50):
+        for _ in range(warmup):
+            func()
+        best = float("inf")
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    func()
+                best = min(best, (time.perf_counter() - start) / iterations)
+        finally:
+            gc.enable()
+
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {"mean_us": round(best * 1e6, 3), "peak_alloc_bytes": peak}
+        self.results[name] = result
+        self.check(name, result)
+        return result
+
+    def check(self, name, result):
+        baseline = self.baselines.get(name)
+        if self.update or baseline is None:
+            return
+        failures = []
+        if result["mean_us"] > baseline["mean_us"] * (1 + self.tolerance):
+            failures.append(f"latency {result['mean_us']} us > baseline {baseline['mean_us']} us (+{self.tolerance:.0%})")
+        if result["peak_alloc_bytes"] > baseline["peak_alloc_bytes"] * (1 + self.alloc_tolerance):
+            failures.append(
+                f"allocations {result['peak_alloc_bytes']} B > baseline {baseline['peak_alloc_bytes']} B (+{self.alloc_tolerance:.0%})"
+            )
+        if failures:
+            pytest.fail(f"{name} regressed: " + "; ".join(failures))
+
+    def save(self):
+        if self.update and self.results:
+            baselines = {**self.baselines, **self.results}
+            BASELINES.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def perf(request):
+    perf = Perf(request.config)
+    yield perf
+    perf.save()
+
+
+# --- In-process ASGI client ---
+# Requests go straight to the app through httpx.ASGITransport, without the
+# thread and portal TestClient uses to run the app.
+@pytest.fixture
+def asgi_get():
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    def get(url):
+        return loop.run_until_complete(client.get(url))
+
+    try:
+        yield get
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
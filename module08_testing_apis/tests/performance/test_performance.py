@@ -0,0 +1,42 @@
+import pytest
+from main import User, reverse_string
+
+# Run with `pytest --perf`; `pytest --perf-update` records new baselines in
+# tests/performance/baselines.json.
+pytestmark = pytest.mark.perf
+
+# --- Fixtures ---
+@pytest.fixture
+def integration_user(db_session):
+    user = User(id=1, name="Integration Alice")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+# --- Function ---
+def test_reverse_string_perf(perf):
+    text = "FastAPI " * 100
+    perf.measure("reverse_string", lambda: reverse_string(text), iterations=20000)
+
+# --- read_user ---
+def test_read_user_testclient_perf(perf, client):
+    def call():
+        assert client.get("/users/1").status_code == 200
+    perf.measure("read_user[testclient]", call, iterations=200)
+
+def test_read_user_asgi_perf(perf, asgi_get):
+    def call():
+        assert asgi_get("/users/1").status_code == 200
+    perf.measure("read_user[asgi]", call, iterations=200)
+
+# --- read_user2 (database) ---
+def test_read_user2_testclient_perf(perf, client, integration_user):
+    def call():
+        assert client.get("/users/integration/1").status_code == 200
+    perf.measure("read_user2[testclient]", call, iterations=200)
+
+def test_read_user2_asgi_perf(perf, client, asgi_get, integration_user):
+    # `client` installs the test database override used by the ASGI client too
+    def call():
+        assert asgi_get("/users/integration/1").status_code == 200
+    perf.measure("read_user2[asgi]", call, iterations=200)
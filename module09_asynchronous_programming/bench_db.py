@@ -0,0 +1,247 @@
+"""Compare the three async database access layers of this module.
+
+- raw driver:  asyncpg pool (main1.py); aiosqlite on the SQLite stand-in
+- databases:   databases.Database (main2.py)
+- SQLAlchemy:  AsyncSession + ORM select (main3.py)
+
+Each layer runs the same point-read and single-row insert workloads at
+several concurrency levels against a `bench_users` table, and the script
+reports throughput, latency percentiles and the per-query overhead of each
+layer relative to the raw driver.
+
+Usage:
+    python bench_db.py                                   # SQLite stand-in (temporary file)
+    python bench_db.py --postgres                        # local PostgreSQL, DB_USER/DB_PASS from .env
+    python bench_db.py --ops 5000 --concurrency 1,16,64
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+import databases
+from dotenv import load_dotenv
+from sqlalchemy import Integer, String, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Mapped, declarative_base, mapped_column
+
+load_dotenv()
+
+SEED_ROWS = 10_000
+
+Base = declarative_base()
+
+
+class BenchUser(Base):
+    __tablename__ = "bench_users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    email: Mapped[str] = mapped_column(String, unique=True)
+
+
+# -----------------------------
+# Layers
+# -----------------------------
+class RawAsyncpg:
+    name = "raw (asyncpg)"
+
+    def __init__(self, url, pool_size):
+        self.url = url
+        self.pool_size = pool_size
+
+    async def connect(self):
+        import asyncpg
+        self.pool = await asyncpg.create_pool(self.url, min_size=self.pool_size, max_size=self.pool_size)
+
+    async def read(self, user_id):
+        async with self.pool.acquire() as conn:
+            return await conn.fetchrow("SELECT id, name, email FROM bench_users WHERE id = $1", user_id)
+
+    async def insert(self, name, email):
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("INSERT INTO bench_users (name, email) VALUES ($1, $2) RETURNING id", name, email)
+
+    async def close(self):
+        await self.pool.close()
+
+
+class RawAiosqlite:
+    name = "raw (aiosqlite)"
+
+    def __init__(self, path, pool_size):
+        self.path = path
+
+    async def connect(self):
+        import aiosqlite
+        self.conn = await aiosqlite.connect(self.path)
+
+    async def read(self, user_id):
+        async with self.conn.execute("SELECT id, name, email FROM bench_users WHERE id = ?", (user_id,)) as cursor:
+            return await cursor.fetchone()
+
+    async def insert(self, name, email):
+        cursor = await self.conn.execute("INSERT INTO bench_users (name, email) VALUES (?, ?)", (name, email))
+        await self.conn.commit()
+        return cursor.lastrowid
+
+    async def close(self):
+        await self.conn.close()
+
+
+class DatabasesLayer:
+    name = "databases"
+
+    def __init__(self, url, pool_size):
+        options = {"min_size": pool_size, "max_size": pool_size} if url.startswith("postgresql") else {}
+        self.database = databases.Database(url, **options)
+
+    async def connect(self):
+        await self.database.connect()
+
+    async def read(self, user_id):
+        return await self.database.fetch_one(
+            "SELECT id, name, email FROM bench_users WHERE id = :id", {"id": user_id}
+        )
+
+    async def insert(self, name, email):
+        return await self.database.execute(
+            "INSERT INTO bench_users (name, email) VALUES (:name, :email)", {"name": name, "email": email}
+        )
+
+    async def close(self):
+        await self.database.disconnect()
+
+
+class SQLAlchemyLayer:
+    name = "SQLAlchemy ORM"
+
+    def __init__(self, url, pool_size):
+        options = {"pool_size": pool_size, "max_overflow": 0} if url.startswith("postgresql") else {}
+        self.engine = create_async_engine(url, **options)
+        self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def connect(self):
+        async with self.engine.connect():
+            pass
+
+    async def read(self, user_id):
+        async with self.sessions() as session:
+            result = await session.execute(select(BenchUser).where(BenchUser.id == user_id))
+            return result.scalars().first()
+
+    async def insert(self, name, email):
+        async with self.sessions() as session:
+            user = BenchUser(name=name, email=email)
+            session.add(user)
+            await session.commit()
+            return user.id
+
+    async def close(self):
+        await self.engine.dispose()
+
+
+# -----------------------------
+# Setup
+# -----------------------------
+async def prepare(sqlalchemy_url):
+    engine = create_async_engine(sqlalchemy_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            BenchUser.__table__.insert(),
+            [{"name": f"user {i}", "email": f"user{i}@example.com"} for i in range(SEED_ROWS)],
+        )
+    await engine.dispose()
+
+
+async def run_workload(layer, workload, ops, concurrency):
+    latencies = []
+    counter = itertools.count()
+    prefix = uuid.uuid4().hex[:8]
+
+    async def worker():
+        while (n := next(counter)) < ops:
+            start = time.perf_counter()
+            if workload == "read":
+                await layer.read(random.randint(1, SEED_ROWS))
+            else:
+                await layer.insert(f"bench {n}", f"{prefix}-{n}-{uuid.uuid4().hex[:6]}@example.com")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000
+
+    return {
+        "ops": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "mean": statistics.fmean(latencies) * 1000,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postgres", action="store_true", help="use the local PostgreSQL database (fastapi_week9)")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per workload and concurrency level")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    if args.postgres:
+        db_user = os.getenv("DB_USER", "postgres")
+        db_pass = os.getenv("DB_PASS", "postgres")
+        base = f"{db_user}:{db_pass}@localhost/fastapi_week9"
+        sqlalchemy_url = f"postgresql+asyncpg://{base}"
+        layers = [
+            RawAsyncpg(f"postgresql://{base}", args.pool_size),
+            DatabasesLayer(f"postgresql://{base}", args.pool_size),
+            SQLAlchemyLayer(sqlalchemy_url, args.pool_size),
+        ]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        sqlalchemy_url = f"sqlite+aiosqlite:///{path}"
+        layers = [
+            RawAiosqlite(path, args.pool_size),
+            DatabasesLayer(f"sqlite+aiosqlite:///{path}", args.pool_size),
+            SQLAlchemyLayer(sqlalchemy_url, args.pool_size),
+        ]
+
+    await prepare(sqlalchemy_url)
+    print(f"{'layer':<18}{'workload':<10}{'conc':>5}{'ops/s':>11}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    baseline = {}
+    overhead = {}
+    for layer in layers:
+        await layer.connect()
+        for workload in ("read", "insert"):
+            for concurrency in levels:
+                r = await run_workload(layer, workload, args.ops, concurrency)
+                print(f"{layer.name:<18}{workload:<10}{concurrency:>5}{r['throughput']:>11,.0f}"
+                      f"{r['mean']:>10.3f}{r['p50']:>9.3f}{r['p95']:>9.3f}{r['p99']:>9.3f}")
+                if concurrency == levels[0]:
+                    # Single-client mean latency: the raw driver is the baseline
+                    baseline.setdefault(workload, r["mean"])
+                    overhead[(layer.name, workload)] = r["mean"] - baseline[workload]
+        await layer.close()
+
+    print(f"\nPer-query overhead vs. the raw driver (mean latency at concurrency {levels[0]}):")
+    for (name, workload), extra in overhead.items():
+        print(f"  {name:<18}{workload:<10}{extra * 1000:+9.1f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+import asyncio
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+logger = logging.getLogger("loop_monitor")
+
+# Upper bounds of the lag histogram buckets, in milliseconds (the last bucket is open-ended)
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LoopMonitor:
+    """Measures how late the event loop runs a timer (scheduling lag).
+
+    A sampler task sleeps `interval` seconds and records how much later than
+    that it woke up: any lag is time the loop spent running something else,
+    typically sync code (a blocking DB call, CPU work) inside an `async def`.
+    Samples go into a histogram; lags over `threshold` are logged.
+
+    With `debug=True` a watchdog thread also notices when the sampler stops
+    waking up and logs the stack of the loop thread while it is still blocked,
+    which points at the offending call. asyncio's own debug mode is switched
+    on as well, so slow callbacks are logged by name."""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, debug: bool = False, history: int = 1000):
+        self.interval = interval
+        self.threshold = threshold
+        self.debug = debug
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self._recent = deque(maxlen=history)
+        self.stalls = deque(maxlen=20)  # stacks captured by the watchdog
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread = None
+
+    @classmethod
+    def from_env(cls):
+        """LOOP_MONITOR=true enables the monitor; LOOP_MONITOR_DEBUG=true adds
+        the watchdog. Returns None when disabled."""
+        if os.getenv("LOOP_MONITOR", "false").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            interval=float(os.getenv("LOOP_MONITOR_INTERVAL", 0.1)),
+            threshold=float(os.getenv("LOOP_MONITOR_THRESHOLD", 0.1)),
+            debug=os.getenv("LOOP_MONITOR_DEBUG", "false").lower() in ("1", "true", "yes"),
+        )
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = loop.create_task(self._sample())
+        if self.debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _sample(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record(max(0.0, now - start - self.interval))
+
+    def record(self, lag: float):
+        self.samples += 1
+        self.total += lag
+        self.max = max(self.max, lag)
+        self._recent.append(lag)
+        self.counts[bisect.bisect_left(BUCKETS_MS, lag * 1000)] += 1
+        if lag > self.threshold:
+            self.slow += 1
+            logger.warning("Event loop lag %.1f ms (threshold %.1f ms)", lag * 1000, self.threshold * 1000)
+
+    def _watch(self):
+        reported = None
+        limit = self.interval + self.threshold
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat
+            if blocked <= limit or heartbeat == reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            # One report per stall: the heartbeat only moves once the loop is free again
+            reported = heartbeat
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls.append({"blocked_ms": round(blocked * 1000, 1), "at": time.time(), "stack": stack})
+            logger.warning("Event loop blocked for %.1f ms, loop thread is at:\n%s", blocked * 1000, stack)
+
+    def metrics(self):
+        recent = sorted(self._recent)
+
+        def percentile(p):
+            return round(recent[min(int(p * len(recent)), len(recent) - 1)] * 1000, 3) if recent else None
+
+        labels = [f"le_{b}ms" for b in BUCKETS_MS] + ["inf"]
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": self.samples,
+            "slow": self.slow,
+            "lag_ms": {
+                "mean": round(self.total / self.samples * 1000, 3) if self.samples else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(self.max * 1000, 3),
+            },
+            "histogram": dict(zip(labels, self.counts)),
+            "stalls": list(self.stalls) if self.debug else None,
+        }
@@ -1,6 +1,7 @@
 import asyncio
 import asyncpg
 import os
+from contextlib import aclosing
 
 from dotenv import load_dotenv
 
@@ -22,18 +23,79 @@ async def greet2():
     print("Hello Async2!")
 
 
-async def fetch_users():
-    conn = await asyncpg.connect(DATABASE_URL)
-    rows = await conn.fetch("SELECT * FROM users;")
-    # Format each row as a dict for readability
-    formatted_rows = [dict(row) for row in rows]
-    
-    # Print formatted records
-    print("Fetched Users:")
-    for record in formatted_rows:
-        print(record)
-    await conn.close()
-    return rows
+# A pool keeps connections open and reuses them, instead of paying the
+# connect/authenticate round trips on every call.
+async def create_pool(min_size: int = 1, max_size: int = 10) -> asyncpg.Pool:
+    return await asyncpg.create_pool(DATABASE_URL, min_size=min_size, max_size=max_size)
+
+
+async def iter_rows(pool: asyncpg.Pool, query: str, *args, batch_size: int = 500):
+    """Async generator over the rows of `query`, fetched `batch_size` rows at
+    a time through a server-side cursor, so memory use does not depend on
+    the size of the result. The statement is prepared once per call.
+
+    The generator holds a pooled connection and an open transaction until it
+    is exhausted or closed. A caller that may stop early (break, exception)
+    must close it, otherwise both stay open until it is garbage collected:
+
+        async with aclosing(iter_rows(pool, query)) as rows:
+            async for row in rows:
+                ..."""
+    async with pool.acquire() as conn:
+        # Server-side cursors only live inside a transaction
+        async with conn.transaction(readonly=True):
+            stmt = await conn.prepare(query)
+            cursor = await stmt.cursor(*args)
+            while True:
+                rows = await cursor.fetch(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+
+
+async def iter_users(pool: asyncpg.Pool, batch_size: int = 500):
+    """Like iter_rows: use it inside aclosing(...)."""
+    # Closing this generator closes iter_rows too, releasing its connection
+    async with aclosing(iter_rows(pool, "SELECT * FROM users ORDER BY id;", batch_size=batch_size)) as rows:
+        async for row in rows:
+            yield row
+
+
+async def fetch_users(pool: asyncpg.Pool = None):
+    """Fetch, print and return all users (a list of records). The whole
+    table is loaded at once: for large tables use print_users/iter_users."""
+    own_pool = pool is None
+    if own_pool:
+        pool = await create_pool()
+    try:
+        rows = await pool.fetch("SELECT * FROM users;")
+        print("Fetched Users:")
+        for row in rows:
+            print(dict(row))
+        return rows
+    finally:
+        if own_pool:
+            await pool.close()
+
+
+async def print_users(pool: asyncpg.Pool = None) -> int:
+    """Streaming variant of fetch_users: prints users as they arrive
+    instead of loading the whole table, and returns how many there were."""
+    own_pool = pool is None
+    if own_pool:
+        pool = await create_pool()
+    try:
+        print("Fetched Users:")
+        count = 0
+        async with aclosing(iter_users(pool)) as records:
+            async for record in records:
+                print(dict(record))
+                count += 1
+        return count
+    finally:
+        if own_pool:
+            await pool.close()
 
 
 async def main_sequential():
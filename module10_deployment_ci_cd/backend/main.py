@@ -10,12 +10,30 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from database import engine, Base
 from fastapi.middleware.cors import CORSMiddleware
+from loop_monitor import LoopMonitor
+from resources import resources
 
 # # Create tables
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI()
 
+# Opt-in event loop lag monitor (LOOP_MONITOR=true, LOOP_MONITOR_DEBUG=true for stacks)
+loop_monitor = LoopMonitor.from_env()
+
+@app.on_event("startup")
+async def startup():
+    if loop_monitor:
+        loop_monitor.start()
+    # App-scoped resources (e.g. the shared HTTP client)
+    await resources.startup(app)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await resources.shutdown(app)
+    if loop_monitor:
+        await loop_monitor.stop()
+
 # Allow requests from the frontend
 app.add_middleware(
     CORSMiddleware,
@@ -33,3 +51,7 @@ def read_root():
     for route in app.routes:
         print(f"{route.path} → {route.name}")
     return {"message": "Welcome to the FastAPI backend!"}
+
+@app.get("/metrics")
+async def metrics():
+    return {"event_loop": loop_monitor.metrics() if loop_monitor else None}
@@ -1,12 +1,14 @@
 import os 
 import httpx
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
 from starlette.responses import RedirectResponse
 from jose import jwt
 
 from sqlalchemy.orm import Session
 from database import get_db  # Your DB session dependency
 from models.user import User  
+from resources import provide, resources
 
 
 GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
@@ -18,6 +20,15 @@ FRONTEND_REDIRECT_URL = "http://localhost:3000/oauth/callback"
 
 router = APIRouter()
 
+
+# One HTTP client for the whole app: its connection pool (and TLS sessions to
+# GitHub) are reused across logins instead of being set up on every callback
+@resources.register(httpx.AsyncClient)
+async def create_http_client():
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        yield client
+
+
 @router.get("/github/login")
 def login_with_github():
     print(GITHUB_CLIENT_ID, GITHUB_CLIENT_SECRET)
@@ -36,7 +47,11 @@ def login_with_github():
 
 
 @router.get("/github/callback")
-async def github_callback(request: Request, db: Session = Depends(get_db)):
+async def github_callback(
+    request: Request,
+    db: Session = Depends(get_db),
+    client: httpx.AsyncClient = Depends(provide(httpx.AsyncClient)),
+):
     print("GitHub callback received")
     code = request.query_params.get("code")
     print(f"Received code: {code}")
@@ -45,57 +60,57 @@ async def github_callback(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Missing GitHub code")
 
     # Step 1: Exchange code for access token
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            "https://github.com/login/oauth/access_token",
-            headers={"Accept": "application/json"},
-            data={
-                "client_id": GITHUB_CLIENT_ID,
-                "client_secret": GITHUB_CLIENT_SECRET,
-                "code": code,
-                "redirect_uri": GITHUB_REDIRECT_URI,
-            },
-        )
-        token_data = token_response.json()
-        access_token = token_data.get("access_token")
-        print(f"Access token: {access_token}")
-        if not access_token:
-            raise HTTPException(status_code=400, detail="GitHub token exchange failed")
-
-        # Step 2: Fetch GitHub user profile
-        user_response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-        user_data = user_response.json()
-        print(f"User data: {user_data}")
+    token_response = await client.post(
+        "https://github.com/login/oauth/access_token",
+        headers={"Accept": "application/json"},
+        data={
+            "client_id": GITHUB_CLIENT_ID,
+            "client_secret": GITHUB_CLIENT_SECRET,
+            "code": code,
+            "redirect_uri": GITHUB_REDIRECT_URI,
+        },
+    )
+    token_data = token_response.json()
+    access_token = token_data.get("access_token")
+    print(f"Access token: {access_token}")
+    if not access_token:
+        raise HTTPException(status_code=400, detail="GitHub token exchange failed")
+
+    # Step 2: Fetch GitHub user profile
+    user_response = await client.get(
+        "https://api.github.com/user",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+    user_data = user_response.json()
+    print(f"User data: {user_data}")
 
-        # Step 3: Get primary email
-        email_response = await client.get(
-            "https://api.github.com/user/emails",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-        email_data = email_response.json()
-        primary_email = next((e["email"] for e in email_data if e.get("primary") and e.get("verified")), None)
-        if not primary_email:
-            raise HTTPException(status_code=400, detail="No verified primary email found")
-
-        # Step 4: Create or get user
-        user = get_or_create_user(
-            db=db,
-            github_id=str(user_data["id"]),
-            email=primary_email,
-            fullname=user_data.get("name"),
-            avatar_url=user_data.get("avatar_url"),
-        )
-        print(f"Store user's data in a local db: {user}")
+    # Step 3: Get primary email
+    email_response = await client.get(
+        "https://api.github.com/user/emails",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+    email_data = email_response.json()
+    primary_email = next((e["email"] for e in email_data if e.get("primary") and e.get("verified")), None)
+    if not primary_email:
+        raise HTTPException(status_code=400, detail="No verified primary email found")
+
+    # Step 4: Create or get user (sync SQLAlchemy, so off the event loop)
+    user = await run_in_threadpool(
+        get_or_create_user,
+        db=db,
+        github_id=str(user_data["id"]),
+        email=primary_email,
+        fullname=user_data.get("name"),
+        avatar_url=user_data.get("avatar_url"),
+    )
+    print(f"Store user's data in a local db: {user}")
 
-        # Step 5: Generate JWT
-        jwt_payload = {"sub": user.username, "email": user.email}
-        token = jwt.encode(jwt_payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    # Step 5: Generate JWT
+    jwt_payload = {"sub": user.username, "email": user.email}
+    token = jwt.encode(jwt_payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
-        # Step 6: Redirect to frontend with token
-        return RedirectResponse(f"{FRONTEND_REDIRECT_URL}?token={token}")
+    # Step 6: Redirect to frontend with token
+    return RedirectResponse(f"{FRONTEND_REDIRECT_URL}?token={token}")
 
 def get_or_create_user(
     db: Session,
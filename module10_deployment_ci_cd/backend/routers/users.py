@@ -3,6 +3,8 @@ from models.user import User, UserRequest, UserResponse, UserLoginRequest, UserL
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from database import get_db
+from fields import select_fields
+from responses import ModelResponse
 from utils import hash_password, verify_password, create_access_token
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -35,8 +37,13 @@ def get_current_user(token: str = Security(oauth2_scheme), db: Session = Depends
         raise credentials_exception
     return user
 
-@router.get("/", dependencies=[Depends(get_current_user)])
-def get_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+# Sparse fieldsets: ?fields=id,username selects only the requested columns
+USER_FIELDS = ("id", "username", "fullname", "email", "github_id", "avatar_url", "auth_provider")
+
+@router.get("/")
+def get_users(fields: str = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    if fields:
+        return select_fields(db.query(User), User, fields, USER_FIELDS)
     users = db.query(User).all()
     return users
 
@@ -68,8 +75,8 @@ def create_user(user_req: UserRequest, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    response = UserResponse(username=new_user.username, email=new_user.email)
-    return response
+    # Built from the row we just stored: serialize directly, no re-validation
+    return ModelResponse(UserResponse.model_construct(username=new_user.username, email=new_user.email))
 
 
    